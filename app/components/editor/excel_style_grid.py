@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from typing import Callable, Dict, List, Optional, Any, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Any, Tuple
 import logging
 import re
 from src.core.i18n import t, I18nMixin
@@ -8,6 +8,38 @@ from src.core.translation_keys import TK
 
 logger = logging.getLogger(__name__)
 
+# Bound number formatters shared by all grid cells
+_FMT2 = '{:.2f}'.format
+_FMT0 = '{:.0f}'.format
+
+
+class ColumnMeta(NamedTuple):
+    """Column definition with its position in the grid"""
+    idx: int
+    key: str
+    header_key: str
+    width: int
+    editable: Any  # True, False or 'conditional'
+    col_type: str
+    bg_type: str
+
+
+class RowInfo:
+    """Hidden per-row material data that is not shown in the grid"""
+    
+    __slots__ = ('source_type', 'solid_content', 'unit_price', 'material_id')
+    
+    def __init__(self, source_type: str = 'manual', solid_content: float = 100.0,
+                 unit_price: float = 0.0, material_id: Optional[int] = None):
+        self.source_type = source_type
+        self.solid_content = solid_content
+        self.unit_price = unit_price
+        self.material_id = material_id
+
+
+# Shared read-only defaults for rows without material data
+_DEFAULT_ROW_INFO = RowInfo()
+
 
 def safe_float(value: Any, default: float = 0.0) -> Tuple[Optional[float], bool]:
     """
@@ -33,6 +65,34 @@ def safe_float(value: Any, default: float = 0.0) -> Tuple[Optional[float], bool]
         return default, False
 
 
+def parse_cells(cells: List[Any], default: float = 0.0) -> Tuple[List[float], List[bool]]:
+    """
+    Convert a column of cell values to floats in a single pass.
+    
+    Equivalent to calling safe_float on every cell, but plain numeric
+    strings (the common case for grid-formatted cells) take a direct
+    float() path.
+    
+    Returns:
+        Tuple of (converted_values, valid_flags)
+    """
+    values = []
+    valid = []
+    for cell in cells:
+        if cell is None or cell == '':
+            values.append(default)
+            valid.append(True)
+            continue
+        try:
+            values.append(float(cell))
+            valid.append(True)
+        except (ValueError, TypeError):
+            value, ok = safe_float(cell, default)
+            values.append(value)
+            valid.append(ok)
+    return values, valid
+
+
 def is_numeric_string(value: str) -> bool:
     """Check if string represents a valid number."""
     if not value or not value.strip():
@@ -43,6 +103,23 @@ def is_numeric_string(value: str) -> bool:
     return bool(re.match(pattern, value.strip().replace(',', '.')))
 
 
+def _place_cell(widget, x: int, y: int, width: int, height: int):
+    """Place a floating edit widget, only moving it if its size is unchanged"""
+    geom = (width, height)
+    if widget._last_geom == geom:
+        widget.place_configure(x=x, y=y)
+    else:
+        widget.place(x=x, y=y, width=width, height=height)
+        widget._last_geom = geom
+
+
+def _forget_cell(widget):
+    """Unplace a floating edit widget if it is currently placed"""
+    if widget._last_geom is not None:
+        widget.place_forget()
+        widget._last_geom = None
+
+
 class EditableCell(ttk.Entry):
     """Floating entry widget for inline cell editing"""
     
@@ -52,6 +129,7 @@ class EditableCell(ttk.Entry):
         self.item_id = None
         self.column = None
         self.original_value = ""
+        self._last_geom = None  # (width, height) while placed
         
         # Bindings
         self.bind('<Return>', self._on_confirm)
@@ -67,11 +145,11 @@ class EditableCell(ttk.Entry):
         
         # Get current value
         values = tree.item(item_id, 'values')
-        col_idx = int(column.replace('#', '')) - 1
+        col_idx = int(column[1:]) - 1
         self.original_value = str(values[col_idx]) if col_idx < len(values) else ""
         
         # Position and show
-        self.place(x=x, y=y, width=width, height=height)
+        _place_cell(self, x, y, width, height)
         self.delete(0, tk.END)
         self.insert(0, self.original_value)
         self.select_range(0, tk.END)
@@ -79,7 +157,7 @@ class EditableCell(ttk.Entry):
     
     def hide(self):
         """Hide the edit widget"""
-        self.place_forget()
+        _forget_cell(self)
         self.tree = None
         self.item_id = None
         self.column = None
@@ -128,7 +206,10 @@ class MaterialAutocompleteCell(ttk.Combobox):
         self.item_id = None
         self.column = None
         self.original_value = ""
+        self._last_geom = None  # (width, height) while placed
         self.all_values = []
+        self._last_typed = ''
+        self._last_filtered = []  # matches for _last_typed
         
         # Bindings
         self.bind('<Return>', self._on_confirm)
@@ -147,21 +228,23 @@ class MaterialAutocompleteCell(ttk.Combobox):
         if values:
             self.all_values = values
             self['values'] = values
+        self._last_typed = ''
+        self._last_filtered = self.all_values
         
         # Get current value
         tree_values = tree.item(item_id, 'values')
-        col_idx = int(column.replace('#', '')) - 1
+        col_idx = int(column[1:]) - 1
         self.original_value = str(tree_values[col_idx]) if col_idx < len(tree_values) else ""
         
         # Position and show
-        self.place(x=x, y=y, width=width, height=height)
+        _place_cell(self, x, y, width, height)
         self.set(self.original_value)
         self.focus_set()
         self.icursor(tk.END)
     
     def hide(self):
         """Hide the combo"""
-        self.place_forget()
+        _forget_cell(self)
         self.tree = None
         self.item_id = None
         self.column = None
@@ -192,9 +275,18 @@ class MaterialAutocompleteCell(ttk.Combobox):
         """Filter dropdown on typing"""
         typed = self.get().lower()
         if not typed:
+            self._last_typed = ''
+            self._last_filtered = self.all_values
             self['values'] = self.all_values
         else:
-            filtered = [v for v in self.all_values if typed in v.lower()]
+            # Typing more characters can only narrow the previous matches
+            if self._last_typed and typed.startswith(self._last_typed):
+                source = self._last_filtered
+            else:
+                source = self.all_values
+            filtered = [v for v in source if typed in v.lower()]
+            self._last_typed = typed
+            self._last_filtered = filtered
             self['values'] = filtered if filtered else self.all_values
     
     def _on_focus_out(self, event=None):
@@ -226,6 +318,9 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
     
     MANUAL_MARKER = '📝 '
     
+    # Rows beyond this many are kept in memory and inserted into the tree on scroll
+    RENDER_BATCH = 100
+    
     def __init__(
         self,
         parent,
@@ -241,7 +336,21 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         self.on_get_materials = on_get_materials
         
         self.row_count = 0
-        self.row_data = {}  # item_id -> {source_type, solid_content, unit_price}
+        self.row_data: Dict[str, RowInfo] = {}
+        self._pending_rows = []  # (values, tags, row_info) loaded but not yet inserted
+        self._last_row_iid: Optional[str] = None  # last item in the tree
+        self._columns = [ColumnMeta(idx, *col) for idx, col in enumerate(self.COLUMNS)]
+        self._col_keys = [col.key for col in self._columns]
+        self._col_editable = [col.editable for col in self._columns]
+        self._first_editable = self._col_editable.index(True)
+        self._header_texts = [''] * len(self._columns)
+        self._value_changed_dispatch = {
+            'material_code': self._handle_material_code_change,
+            'material_name': self._handle_material_name_change,
+            'solid_pct': self._handle_solid_pct_change,
+            'unit_price': self._handle_unit_price_change,
+            'weight': self._handle_weight_change,
+        }
         
         self.setup_i18n()
         self._create_ui()
@@ -255,21 +364,20 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         container = ttk.Frame(self)
         container.pack(fill=tk.BOTH, expand=True)
         
-        columns = tuple(col[0] for col in self.COLUMNS)
-        self.tree = ttk.Treeview(container, columns=columns, show='headings', selectmode='browse')
+        self.tree = ttk.Treeview(container, columns=tuple(self._col_keys), show='headings', selectmode='browse')
         
-        for key, header_key, width, editable, col_type, bg_type in self.COLUMNS:
-            anchor = 'e' if col_type in ('number', 'percent', 'currency') else 'w'
-            if key == 'row_num':
+        for col in self._columns:
+            anchor = 'e' if col.col_type in ('number', 'percent', 'currency') else 'w'
+            if col.key == 'row_num':
                 anchor = 'center'
-            self.tree.column(key, width=width, anchor=anchor, minwidth=width//2)
+            self.tree.column(col.key, width=col.width, anchor=anchor, minwidth=col.width//2)
         
-        y_scroll = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.tree.yview)
+        self.y_scroll = ttk.Scrollbar(container, orient=tk.VERTICAL, command=self.tree.yview)
         x_scroll = ttk.Scrollbar(container, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        self.tree.configure(yscrollcommand=self._on_tree_yscroll, xscrollcommand=x_scroll.set)
         
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         self.tree.bind('<Double-1>', self._on_double_click)
         self.tree.bind('<Return>', self._on_enter_key)
@@ -284,10 +392,19 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         
         self._update_texts()
 
+    def _on_tree_yscroll(self, first, last):
+        """Forward scroll position and render pending rows near the bottom"""
+        self.y_scroll.set(first, last)
+        if self._pending_rows and float(last) >= 0.9:
+            self._render_pending(self.RENDER_BATCH)
+
     def _update_texts(self):
         """Update grid headers"""
-        for key, header_key, width, editable, col_type, bg_type in self.COLUMNS:
-            self.tree.heading(key, text=t(header_key), anchor='center')
+        for col in self._columns:
+            text = t(col.header_key)
+            if text != self._header_texts[col.idx]:
+                self._header_texts[col.idx] = text
+                self.tree.heading(col.key, text=text, anchor='center')
 
     def _create_edit_widgets(self):
         self.edit_entry = EditableCell(self)
@@ -307,13 +424,13 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         column = self.tree.identify_column(event.x)
         if not item_id or not column: return
         
-        col_idx = int(column.replace('#', '')) - 1
-        if col_idx < 0 or col_idx >= len(self.COLUMNS): return
-        
-        col_key, header_key, col_width, editable, col_type, bg_type = self.COLUMNS[col_idx]
+        col_idx = int(column[1:]) - 1
+        if col_idx < 0 or col_idx >= len(self._col_editable): return
         
+        editable = self._col_editable[col_idx]
         if editable == 'conditional':
-            if item_id not in self.row_data or self.row_data.get(item_id, {}).get('source_type') != 'manual':
+            row_info = self.row_data.get(item_id)
+            if row_info is None or row_info.source_type != 'manual':
                 return
         elif not editable:
             return
@@ -326,11 +443,7 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
     def _on_enter_key(self, event):
         selection = self.tree.selection()
         if selection:
-            item_id = selection[0]
-            for col_idx, (key, h, w, editable, ct, bt) in enumerate(self.COLUMNS):
-                if editable:
-                    self._start_editing(item_id, f'#{col_idx + 1}')
-                    break
+            self._start_editing(selection[0], f'#{self._first_editable + 1}')
 
     def _on_delete_key(self, event):
         selection = self.tree.selection()
@@ -345,8 +458,8 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         item_id = widget.item_id
         column = widget.column
         new_value = widget.get_value()
-        col_idx = int(column.replace('#', '')) - 1
-        col_key = self.COLUMNS[col_idx][0]
+        col_idx = int(column[1:]) - 1
+        col_key = self._col_keys[col_idx]
         
         values = list(self.tree.item(item_id, 'values'))
         old_value = values[col_idx] if col_idx < len(values) else ""
@@ -368,116 +481,101 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         item_id = widget.item_id
         column = widget.column
         new_value = widget.get_value()
-        col_idx = int(column.replace('#', '')) - 1
+        col_idx = int(column[1:]) - 1
         
         values = list(self.tree.item(item_id, 'values'))
         if col_idx < len(values):
             values[col_idx] = new_value
             self.tree.item(item_id, values=values)
-            self._on_value_changed(item_id, self.COLUMNS[col_idx][0], new_value)
+            self._on_value_changed(item_id, self._col_keys[col_idx], new_value)
         
         widget.hide()
         
-        next_col_idx = col_idx + 1
-        while next_col_idx < len(self.COLUMNS):
-            if self.COLUMNS[next_col_idx][3]:
+        col_editable = self._col_editable
+        for next_col_idx in range(col_idx + 1, len(col_editable)):
+            if col_editable[next_col_idx]:
                 self._start_editing(item_id, f'#{next_col_idx + 1}')
                 return
-            next_col_idx += 1
         
         next_item = self.tree.next(item_id)
-        if next_item:
-            for nci, (k, h, w, ed, ct, bt) in enumerate(self.COLUMNS):
-                if ed:
-                    self._start_editing(next_item, f'#{nci + 1}')
-                    return
-        
-        new_item = self._add_empty_row()
-        for nci, (k, h, w, ed, ct, bt) in enumerate(self.COLUMNS):
-            if ed:
-                self._start_editing(new_item, f'#{nci + 1}')
-                return
+        if not next_item and self._pending_rows:
+            self._render_pending(self.RENDER_BATCH)
+            next_item = self.tree.next(item_id)
+        if not next_item:
+            next_item = self._add_empty_row()
+        self._start_editing(next_item, f'#{self._first_editable + 1}')
 
     def _on_material_selected(self, event=None): pass
 
     def _on_value_changed(self, item_id: str, column_key: str, value: str):
-        values = list(self.tree.item(item_id, 'values'))
-        while len(values) < 8: values.append('')
-        
-        if column_key == 'material_code':
-            material = None
-            if self.on_material_lookup and value:
-                material = self.on_material_lookup(value)
-            
-            if material:
-                material_name = material.get('name', value)
-                solid_content = material.get('solid_content', 100) or 100
-                unit_price = material.get('unit_price', 0) or 0
-                values[2] = material_name
-                values[4] = f"{solid_content:.0f}"
-                values[6] = f"{unit_price:.2f}" if unit_price else ""
-                self.row_data[item_id] = {
-                    'source_type': 'db',
-                    'solid_content': solid_content,
-                    'unit_price': unit_price,
-                    'material_id': material.get('id'),
-                }
-                self.tree.item(item_id, values=values, tags=('db_row',))
-            elif value:
-                values[2] = f"{self.MANUAL_MARKER}{value}"
-                values[4] = "100"
-                values[6] = ""
-                self.row_data[item_id] = {
-                    'source_type': 'manual',
-                    'solid_content': 100,
-                    'unit_price': 0,
-                }
-                self.tree.item(item_id, values=values, tags=('manual_row',))
-            else:
-                for i in range(2, 8): values[i] = ''
-                self.tree.item(item_id, values=values, tags=('empty',))
-                self.row_data.pop(item_id, None)
-            
-            if values[3]: self._recalculate_row(item_id)
-        
-        elif column_key == 'material_name':
-            row_info = self.row_data.get(item_id, {})
-            if row_info.get('source_type') == 'manual':
-                values[2] = f"{self.MANUAL_MARKER}{value}" if not value.startswith(self.MANUAL_MARKER) else value
-                self.tree.item(item_id, values=values)
-        
-        elif column_key == 'solid_pct':
-            row_info = self.row_data.get(item_id, {})
-            if row_info.get('source_type') == 'manual':
-                try:
-                    solid_content = float(value) if value else 100
-                    row_info['solid_content'] = solid_content
-                    values[4] = f"{solid_content:.0f}"
-                    self.tree.item(item_id, values=values)
-                    self._recalculate_row(item_id)
-                except ValueError: pass
-        
-        elif column_key == 'unit_price':
-            row_info = self.row_data.get(item_id, {})
-            if row_info.get('source_type') == 'manual':
-                try:
-                    unit_price = float(value) if value else 0
-                    row_info['unit_price'] = unit_price
-                    values[6] = f"{unit_price:.2f}" if unit_price else ""
-                    self.tree.item(item_id, values=values)
-                    self._recalculate_row(item_id)
-                except ValueError: pass
-        
-        elif column_key == 'weight':
-            self._recalculate_row(item_id)
+        handler = self._value_changed_dispatch.get(column_key)
+        if handler:
+            values = list(self.tree.item(item_id, 'values'))
+            while len(values) < 8: values.append('')
+            handler(item_id, values, self.row_data.get(item_id), value)
         
         if self.on_row_changed:
             self.on_row_changed(item_id)
 
+    def _handle_material_code_change(self, item_id: str, values: List[str], row_info: Optional[RowInfo], value: str):
+        material = None
+        if self.on_material_lookup and value:
+            material = self.on_material_lookup(value)
+        
+        if material:
+            material_name = material.get('name', value)
+            solid_content = material.get('solid_content', 100) or 100
+            unit_price = material.get('unit_price', 0) or 0
+            values[2] = material_name
+            values[4] = _FMT0(solid_content)
+            values[6] = _FMT2(unit_price) if unit_price else ""
+            self.row_data[item_id] = RowInfo('db', solid_content, unit_price, material.get('id'))
+            self.tree.item(item_id, values=values, tags=('db_row',))
+        elif value:
+            values[2] = f"{self.MANUAL_MARKER}{value}"
+            values[4] = "100"
+            values[6] = ""
+            self.row_data[item_id] = RowInfo('manual', 100, 0)
+            self.tree.item(item_id, values=values, tags=('manual_row',))
+        else:
+            for i in range(2, 8): values[i] = ''
+            self.tree.item(item_id, values=values, tags=('empty',))
+            self.row_data.pop(item_id, None)
+        
+        if values[3]: self._recalculate_row(item_id)
+
+    def _handle_material_name_change(self, item_id: str, values: List[str], row_info: Optional[RowInfo], value: str):
+        if row_info is not None and row_info.source_type == 'manual':
+            values[2] = f"{self.MANUAL_MARKER}{value}" if not value.startswith(self.MANUAL_MARKER) else value
+            self.tree.item(item_id, values=values)
+
+    def _handle_solid_pct_change(self, item_id: str, values: List[str], row_info: Optional[RowInfo], value: str):
+        if row_info is not None and row_info.source_type == 'manual':
+            try:
+                solid_content = float(value) if value else 100
+                row_info.solid_content = solid_content
+                values[4] = _FMT0(solid_content)
+                self.tree.item(item_id, values=values)
+                self._recalculate_row(item_id)
+            except ValueError: pass
+
+    def _handle_unit_price_change(self, item_id: str, values: List[str], row_info: Optional[RowInfo], value: str):
+        if row_info is not None and row_info.source_type == 'manual':
+            try:
+                unit_price = float(value) if value else 0
+                row_info.unit_price = unit_price
+                values[6] = _FMT2(unit_price) if unit_price else ""
+                self.tree.item(item_id, values=values)
+                self._recalculate_row(item_id)
+            except ValueError: pass
+
+    def _handle_weight_change(self, item_id: str, values: List[str], row_info: Optional[RowInfo], value: str):
+        self._recalculate_row(item_id)
+
     def _start_editing(self, item_id: str, column: str):
-        col_idx = int(column.replace('#', '')) - 1
-        if col_idx < 0 or col_idx >= len(self.COLUMNS): return
-        if not self.COLUMNS[col_idx][3]: return
+        col_idx = int(column[1:]) - 1
+        if col_idx < 0 or col_idx >= len(self._col_editable): return
+        if not self._col_editable[col_idx]: return
         self.tree.see(item_id)
         self.tree.selection_set(item_id)
         self.update_idletasks()
@@ -490,15 +588,17 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         self.row_count += 1
         values = [str(self.row_count), '', '', '', '', '', '', '']
         item_id = self.tree.insert('', 'end', values=values, tags=('empty',))
+        self._last_row_iid = item_id
         return item_id
 
     def _ensure_empty_row(self):
-        children = self.tree.get_children()
-        if children:
-            last_values = self.tree.item(children[-1], 'values')
-            if last_values[1] or last_values[3]:
-                self._add_empty_row()
-        else:
+        if self._pending_rows:
+            return  # Added once the last pending row is rendered
+        if self._last_row_iid is None:
+            self._add_empty_row()
+            return
+        last_values = self.tree.item(self._last_row_iid, 'values')
+        if last_values[1] or last_values[3]:
             self._add_empty_row()
 
     def _recalculate_row(self, item_id: str):
@@ -506,77 +606,176 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
         while len(values) < 8: values.append('')
         try: weight = float(values[3]) if values[3] else 0
         except ValueError: weight = 0
-        row_info = self.row_data.get(item_id, {})
-        try: solid_content = float(values[4]) if values[4] else row_info.get('solid_content', 100)
-        except ValueError: solid_content = row_info.get('solid_content', 100)
-        try: unit_price = float(values[6]) if values[6] else row_info.get('unit_price', 0)
-        except ValueError: unit_price = row_info.get('unit_price', 0)
+        row_info = self.row_data.get(item_id, _DEFAULT_ROW_INFO)
+        try: solid_content = float(values[4]) if values[4] else row_info.solid_content
+        except ValueError: solid_content = row_info.solid_content
+        try: unit_price = float(values[6]) if values[6] else row_info.unit_price
+        except ValueError: unit_price = row_info.unit_price
+        old_derived = (values[5], values[7])
         solid_weight = weight * (solid_content / 100)
-        values[5] = f"{solid_weight:.2f}" if solid_weight > 0 else ""
+        values[5] = _FMT2(solid_weight) if solid_weight > 0 else ""
         total_price = weight * unit_price
-        values[7] = f"{total_price:.2f}" if total_price > 0 else ""
+        values[7] = _FMT2(total_price) if total_price > 0 else ""
+        if (values[5], values[7]) == old_derived:
+            return  # Nothing visible changed, skip the Tcl round-trip
         self.tree.item(item_id, values=values)
 
     def delete_row(self, item_id: str):
         self.tree.delete(item_id)
         self.row_data.pop(item_id, None)
+        if item_id == self._last_row_iid:
+            children = self.tree.get_children()
+            self._last_row_iid = children[-1] if children else None
         self._renumber_rows()
         self._ensure_empty_row()
+        if self.on_row_changed:
+            self.on_row_changed(item_id)
 
     def _renumber_rows(self):
+        idx = 0
+        tree_item = self.tree.item
         for idx, item_id in enumerate(self.tree.get_children(), 1):
-            values = list(self.tree.item(item_id, 'values'))
+            values = list(tree_item(item_id, 'values'))
             values[0] = str(idx)
-            self.tree.item(item_id, values=values)
-        self.row_count = len(self.tree.get_children())
+            tree_item(item_id, values=values)
+        for offset, (values, tags, row_info) in enumerate(self._pending_rows, idx + 1):
+            values[0] = str(offset)
+        self.row_count = idx + len(self._pending_rows)
 
     def clear_all(self):
         for item in self.tree.get_children(): self.tree.delete(item)
+        self._last_row_iid = None
         self.row_count = 0
         self.row_data.clear()
+        self._pending_rows = []
         for _ in range(5): self._add_empty_row()
 
+    def load_data(self, data: List[Dict]):
+        """
+        Load rows into the grid.
+        
+        Only the first RENDER_BATCH rows are inserted into the tree; the rest
+        are kept in memory and rendered as the user scrolls towards them.
+        """
+        self.tree.delete(*self.tree.get_children())
+        self._last_row_iid = None
+        self.row_data.clear()
+        
+        pending = []
+        for row_num, row in enumerate(data, 1):
+            pending.append(self._build_row(row_num, row))
+        self._pending_rows = pending
+        self.row_count = len(pending)
+        
+        self._render_pending(self.RENDER_BATCH)
+        self._ensure_empty_row()
+
+    def begin_bulk_update(self):
+        """Prepare for a large load: drop the selection and hide the columns until end_bulk_update()"""
+        selection = self.tree.selection()
+        if selection: self.tree.selection_remove(selection)
+        self.tree.configure(displaycolumns=())
+
+    def end_bulk_update(self):
+        """Restore the columns and run a single layout pass"""
+        self.tree.configure(displaycolumns='#all')
+        self.tree.update_idletasks()
+
+    def _build_row(self, row_num: int, row: Dict) -> Tuple[List[str], Tuple[str, ...], RowInfo]:
+        """Build tree values, tags and hidden row info from a component dict"""
+        material_code = row.get('material_code', row.get('code', '')) or ''
+        material_name = row.get('material_name', row.get('name', '')) or ''
+        source_type = row.get('source_type', 'db')
+        weight, _ = safe_float(row.get('weight', row.get('quantity', 0)), 0)
+        solid_content, _ = safe_float(row.get('solid_content', 100), 100)
+        unit_price, _ = safe_float(row.get('unit_price', 0), 0)
+        
+        manual = source_type == 'manual'
+        if manual and not material_name.startswith(self.MANUAL_MARKER):
+            material_name = self.MANUAL_MARKER + material_name
+        
+        if weight:
+            solid_weight = weight * (solid_content / 100)
+            total_price = weight * unit_price
+            weight_str = _FMT2(weight)
+            solid_weight_str = _FMT2(solid_weight) if solid_weight > 0 else ""
+            total_price_str = _FMT2(total_price) if total_price > 0 else ""
+        else:
+            weight_str = solid_weight_str = total_price_str = ""
+        
+        values = [str(row_num), str(material_code), material_name, weight_str, _FMT0(solid_content),
+                  solid_weight_str, _FMT2(unit_price) if unit_price else "", total_price_str]
+        tags = ('manual_row',) if manual else ('db_row',)
+        return values, tags, RowInfo(source_type, solid_content, unit_price, row.get('material_id'))
+
+    def _render_pending(self, count: int):
+        """Insert up to `count` pending rows into the tree"""
+        batch = self._pending_rows[:count]
+        del self._pending_rows[:count]
+        tree_insert = self.tree.insert
+        row_data = self.row_data
+        item_id = None
+        for values, tags, row_info in batch:
+            item_id = tree_insert('', 'end', values=values, tags=tags)
+            row_data[item_id] = row_info
+        if item_id is not None:
+            self._last_row_iid = item_id
+        if batch and not self._pending_rows:
+            self._ensure_empty_row()
+
     def get_data(self) -> List[Dict]:
         data = []
         errors = []
-        for item_id in self.tree.get_children():
-            tags = list(self.tree.item(item_id, 'tags'))
+        tree_item = self.tree.item
+        children = self.tree.get_children()
+        for item_id in children:
+            tags = list(tree_item(item_id, 'tags'))
             if 'error_row' in tags:
                 tags.remove('error_row')
-                self.tree.item(item_id, tags=tuple(tags))
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            if not values[1] and not values[3]: continue
-            row_info = self.row_data.get(item_id, {})
+                tree_item(item_id, tags=tuple(tags))
+        row_info_get = self.row_data.get
+        rows = [(item_id, tree_item(item_id, 'values'), row_info_get(item_id, _DEFAULT_ROW_INFO))
+                for item_id in children]
+        rows.extend((None, values, row_info) for values, tags, row_info in self._pending_rows)
+        rows = [row for row in rows if row[1][1] or row[1][3]]
+        
+        # Parse each numeric column in one pass
+        def column(idx: int) -> List[Any]:
+            return [values[idx] if len(values) > idx else '' for _, values, _ in rows]
+        weights, weights_valid = parse_cells(column(3), 0)
+        solid_pcts, solids_valid = parse_cells(column(4), 100)
+        solid_weights, sws_valid = parse_cells(column(5), 0)
+        unit_prices, ups_valid = parse_cells(column(6), 0)
+        total_prices, tps_valid = parse_cells(column(7), 0)
+        
+        for i, (item_id, values, row_info) in enumerate(rows):
             row_num = values[0]
             material_name = values[2] if len(values) > 2 else ''
             if material_name.startswith(self.MANUAL_MARKER):
                 material_name = material_name[len(self.MANUAL_MARKER):]
-            weight, weight_valid = safe_float(values[3] if len(values) > 3 else '', 0)
-            solid_pct, solid_valid = safe_float(values[4] if len(values) > 4 else '', 100)
-            solid_weight, sw_valid = safe_float(values[5] if len(values) > 5 else '', 0)
-            unit_price, up_valid = safe_float(values[6] if len(values) > 6 else '', 0)
-            total_price, tp_valid = safe_float(values[7] if len(values) > 7 else '', 0)
-            if not all([weight_valid, solid_valid, sw_valid, up_valid, tp_valid]):
+            weight_valid, solid_valid, up_valid = weights_valid[i], solids_valid[i], ups_valid[i]
+            is_valid = weight_valid and solid_valid and sws_valid[i] and up_valid and tps_valid[i]
+            if not is_valid:
                 invalid_fields = []
                 if not weight_valid: invalid_fields.append(t(TK.GRID_WEIGHT))
                 if not solid_valid: invalid_fields.append(t(TK.GRID_SOLID_PCT))
                 if not up_valid: invalid_fields.append(t(TK.GRID_UNIT_PRICE))
                 errors.append(f"{t(TK.FORM_ROW_COUNT)} {row_num}: {', '.join(invalid_fields)} {t(TK.ERROR)}")
-                self.tree.item(item_id, tags=('error_row',))
+                if item_id:
+                    tree_item(item_id, tags=('error_row',))
             row_data = {
                 'row_num': row_num,
                 'material_code': values[1],
                 'material_name': material_name,
-                'weight': weight,
-                'solid_pct': solid_pct,
-                'solid_weight': solid_weight,
-                'unit_price': unit_price,
-                'total_price': total_price,
-                'source_type': row_info.get('source_type', 'manual'),
-                'material_id': row_info.get('material_id'),
-                'solid_content': row_info.get('solid_content', 100),
-                '_valid': all([weight_valid, solid_valid, sw_valid, up_valid, tp_valid]),
+                'weight': weights[i],
+                'solid_pct': solid_pcts[i],
+                'solid_weight': solid_weights[i],
+                'unit_price': unit_prices[i],
+                'total_price': total_prices[i],
+                'source_type': row_info.source_type,
+                'material_id': row_info.material_id,
+                'solid_content': row_info.solid_content,
+                '_valid': is_valid,
             }
             data.append(row_data)
         self._last_validation_errors = errors
@@ -590,23 +789,44 @@ class ExcelStyleGrid(ttk.Frame, I18nMixin):
             return None, errors
         return data, []
 
-    def get_totals(self) -> Dict:
+    def has_pending_rows(self) -> bool:
+        """Whether loaded rows are still waiting to be inserted into the tree"""
+        return bool(self._pending_rows)
+
+    @staticmethod
+    def _row_totals(values) -> Tuple[float, float, float, int]:
+        """A row's (weight, solid, price, count) contribution to get_totals()"""
+        if not values or (not values[1] and not values[3]): return (0, 0, 0, 0)
+        try:
+            weight = float(values[3]) if len(values) > 3 and values[3] else 0
+            solid = float(values[5]) if len(values) > 5 and values[5] else 0
+            price = float(values[7]) if len(values) > 7 and values[7] else 0
+        except ValueError: return (0, 0, 0, 1)
+        return (weight, solid, price, 1)
+
+    def get_row_totals(self, item_id: str) -> Tuple[float, float, float, int]:
+        """Contribution of one tree row to get_totals(); zeros if it no longer exists"""
+        if not self.tree.exists(item_id): return (0, 0, 0, 0)
+        return self._row_totals(self.tree.item(item_id, 'values'))
+
+    def get_totals(self, per_row: Optional[Dict[str, Tuple[float, float, float, int]]] = None) -> Dict:
+        """Sum all rows; if `per_row` is given it is filled with each tree row's contribution"""
         total_weight = 0
         total_solid = 0
         total_price = 0
         row_count = 0
-        for item_id in self.tree.get_children():
-            values = self.tree.item(item_id, 'values')
-            if not values[1] and not values[3]: continue
-            row_count += 1
-            try:
-                weight = float(values[3]) if len(values) > 3 and values[3] else 0
-                solid = float(values[5]) if len(values) > 5 and values[5] else 0
-                price = float(values[7]) if len(values) > 7 and values[7] else 0
-                total_weight += weight
-                total_solid += solid
-                total_price += price
-            except ValueError: pass
+        tree_item = self.tree.item
+        row_totals = self._row_totals
+        rows = [(item_id, tree_item(item_id, 'values')) for item_id in self.tree.get_children()]
+        rows.extend((None, values) for values, tags, row_info in self._pending_rows)
+        for item_id, values in rows:
+            weight, solid, price, count = row_totals(values)
+            if per_row is not None and item_id is not None:
+                per_row[item_id] = (weight, solid, price, count)
+            total_weight += weight
+            total_solid += solid
+            total_price += price
+            row_count += count
         return {
             'total_quantity': total_weight,
             'total_solid': total_solid,
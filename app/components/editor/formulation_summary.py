@@ -6,12 +6,45 @@ Formülasyon özet bilgileri bileşeni
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _fmt2(value: float) -> str:
+    """İki ondalıklı biçimlendirme (tekrarlanan değerler önbellekten)"""
+    return f"{value:.2f}"
+
+
+# Alan başına biçimlendirici
+_FMT_FORMAT = {
+    'total_solid': _fmt2,
+    'total_percent': _fmt2,
+    'total_cost': _fmt2,
+    'pvc': _fmt2,
+    'voc': _fmt2,
+    'row_count': str,  # Tamsayı, olduğu gibi gösterilir
+}
+
+# Sıfırlanmış ham değerler (row_count int olarak kalır)
+_ZERO_RAW = {**dict.fromkeys(_FMT_FORMAT, 0.0), 'row_count': 0}
+
+# (anahtar, etiket, birim, değer genişliği)
+_LEFT_FIELDS = (
+    ('total_solid', 'Toplam Katı:', ' kg', 8),
+    ('total_percent', 'Toplam %:', ' %', 6),
+    ('total_cost', 'Toplam Maliyet:', ' TL', 10),
+)
+_RIGHT_FIELDS = (
+    ('pvc', 'PVC (%):', ' %', 6),
+    ('voc', 'VOC (g/L):', ' g/L', 7),
+    ('row_count', 'Satır Sayısı:', '', 4),
+)
+
+
 class FormulationSummary(ttk.LabelFrame):
     """
     Formülasyon özet bilgileri paneli
@@ -23,62 +56,66 @@ class FormulationSummary(ttk.LabelFrame):
     def __init__(self, parent):
         super().__init__(parent, text="📊 Özet Bilgiler", padding=5)
         
-        self.values = {}
+        self._last_text: Dict[str, str] = {}  # son gösterilen metinler
+        self._raw: Dict[str, Union[float, str]] = dict(_ZERO_RAW)  # ham değerler
+        self._pending_data: Optional[Dict] = None  # boşta yazılacak değerler
+        self._after_id = None
+        self._last_totals_key = None  # son işlenen grid toplamları
+        self._scratch = dict(_ZERO_RAW)  # update_from_grid için yeniden kullanılır
         self._create_widgets()
     
     def _create_widgets(self):
         """Widget'ları oluştur"""
-        # Sol taraf değerler
-        left_frame = ttk.Frame(self)
-        left_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        # Her taraf tek bir sabit genişlikli etiket; alanlar metin içinde hizalanır
+        self._left_var = tk.StringVar(master=self)
+        ttk.Label(self, textvariable=self._left_var, font=("Courier", 10)).pack(
+            side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Sağ taraf değerler
-        right_frame = ttk.Frame(self)
-        right_frame.pack(side=tk.RIGHT, fill=tk.X, expand=True)
+        self._right_var = tk.StringVar(master=self)
+        ttk.Label(self, textvariable=self._right_var, font=("Courier", 10)).pack(
+            side=tk.RIGHT, fill=tk.X, expand=True)
         
-        # Sol taraf alanları
-        left_fields = [
-            ('total_solid', 'Toplam Katı:', 'kg'),
-            ('total_percent', 'Toplam %:', '%'),
-            ('total_cost', 'Toplam Maliyet:', 'TL'),
-        ]
-        
-        for i, (key, label, unit) in enumerate(left_fields):
-            ttk.Label(left_frame, text=label).grid(row=0, column=i*3, padx=2)
-            value_label = ttk.Label(left_frame, text="0", font=("Helvetica", 10, "bold"))
-            value_label.grid(row=0, column=i*3+1, padx=2)
-            ttk.Label(left_frame, text=unit).grid(row=0, column=i*3+2, padx=(0, 10))
-            self.values[key] = value_label
-        
-        # Sağ taraf alanları
-        right_fields = [
-            ('pvc', 'PVC (%):', '%'),
-            ('voc', 'VOC (g/L):', 'g/L'),
-            ('row_count', 'Satır Sayısı:', ''),
-        ]
-        
-        for i, (key, label, unit) in enumerate(right_fields):
-            ttk.Label(right_frame, text=label).grid(row=0, column=i*3, padx=2)
-            value_label = ttk.Label(right_frame, text="0", font=("Helvetica", 10, "bold"))
-            value_label.grid(row=0, column=i*3+1, padx=2)
-            if unit:
-                ttk.Label(right_frame, text=unit).grid(row=0, column=i*3+2, padx=(0, 10))
-            self.values[key] = value_label
+        self._sides = ((self._left_var, _LEFT_FIELDS), (self._right_var, _RIGHT_FIELDS))
+        # (anahtar, taraf, biçimlendirici) - refresh() bu sabit sırayı izler
+        self._update_plan = tuple(
+            (key, side, _FMT_FORMAT[key])
+            for side in self._sides
+            for key, _, _, _ in side[1]
+        )
+        self._render_sides(self._sides)
     
-    def update(self, data: Dict):
+    def _render_sides(self, sides):
+        """Verilen tarafların metnini alan değerlerinden yeniden oluştur"""
+        last_text = self._last_text
+        for var, fields in sides:
+            var.set("   ".join(
+                f"{label} {last_text.get(key, '0'):>{width}}{unit}"
+                for key, label, unit, width in fields
+            ))
+    
+    def refresh(self, data: Dict):
         """
         Özet değerlerini güncelle
         
         Args:
             data: Güncellenecek değerler sözlüğü
         """
-        for key, value in data.items():
-            if key in self.values:
-                if isinstance(value, float):
-                    display_value = f"{value:.2f}"
-                else:
-                    display_value = str(value)
-                self.values[key].config(text=display_value)
+        changed = []
+        raw = self._raw
+        last_text = self._last_text
+        for key, side, fmt in self._update_plan:
+            value = data.get(key)
+            if value is None:
+                continue
+            raw[key] = value
+            display_value = fmt(value)
+            if last_text.get(key) == display_value:
+                continue
+            last_text[key] = display_value
+            if side not in changed:
+                changed.append(side)
+        if changed:
+            self._render_sides(changed)
     
     def update_from_grid(self, grid_totals: Dict):
         """
@@ -92,30 +129,56 @@ class FormulationSummary(ttk.LabelFrame):
         total_price = grid_totals.get('total_price', 0)
         row_count = grid_totals.get('row_count', 0)
         
-        # Yüzde hesapla
-        total_percent = 100.0 if total_amount > 0 else 0.0
+        key = (total_amount, total_solid, total_price, row_count)
+        if key == self._last_totals_key:
+            return  # Değişiklik yok
+        self._last_totals_key = key
         
-        # PVC hesapla (basit tahmin)
-        pvc = 0.0
+        # Yüzde, PVC (basit tahmin) ve VOC tahmini tek dalda
         if total_amount > 0:
-            pvc = (total_solid / total_amount) * 100
+            inv = 1.0 / total_amount
+            pvc = total_solid * 100.0 * inv
+            diff = total_amount - total_solid
+            voc = diff * 1000.0 * inv if diff > 0 else 0.0
+            total_percent = 100.0
+        else:
+            pvc = voc = 0.0
+            total_percent = 0.0
         
-        # VOC tahmini (varsayılan)
-        voc = max(0, (total_amount - total_solid) * 1000 / max(1, total_amount))
+        scratch = self._scratch
+        scratch['total_solid'] = total_solid
+        scratch['total_percent'] = total_percent
+        scratch['total_cost'] = total_price
+        scratch['pvc'] = pvc
+        scratch['voc'] = voc
+        scratch['row_count'] = row_count
+        # Ham değerler hemen güncellenir; get_summary() beklemeden doğru döner
+        self._raw.update(scratch)
         
-        self.update({
-            'total_solid': total_solid,
-            'total_percent': total_percent,
-            'total_cost': total_price,
-            'pvc': pvc,
-            'voc': voc,
-            'row_count': row_count
-        })
+        # Etiket yazımları ertelenir; ardışık çağrılar tek bir boşta yazmada birleştirilir
+        self._pending_data = scratch
+        if self._after_id is None:
+            self._after_id = self.after_idle(self._flush)
+    
+    def _flush(self):
+        """Bekleyen özet değerlerini etiketlere yaz"""
+        self._after_id = None
+        data, self._pending_data = self._pending_data, None
+        if data is not None:
+            self.refresh(data)
     
     def clear(self):
         """Tüm değerleri sıfırla"""
-        for label in self.values.values():
-            label.config(text="0")
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending_data = None
+        self._last_totals_key = None
+        self._raw = dict(_ZERO_RAW)
+        if not self._last_text:
+            return  # Etiketler zaten sıfır
+        self._last_text.clear()
+        self._render_sides(self._sides)
     
     def get_summary(self) -> Dict:
         """
@@ -124,10 +187,4 @@ class FormulationSummary(ttk.LabelFrame):
         Returns:
             Dict: Mevcut özet değerleri
         """
-        result = {}
-        for key, label in self.values.items():
-            try:
-                result[key] = float(label.cget('text'))
-            except ValueError:
-                result[key] = label.cget('text')
-        return result
+        return dict(self._raw)
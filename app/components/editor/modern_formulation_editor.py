@@ -8,8 +8,11 @@ This is a modern replacement for the old split-input layout.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
+import sys
+from functools import lru_cache
 import threading
+import time
 import logging
 
 from src.core.i18n import t, I18nMixin
@@ -18,6 +21,71 @@ from app.components.editor.excel_style_grid import ExcelStyleGrid
 
 logger = logging.getLogger(__name__)
 
+# Translation keys that may be missing from older key sets (resolved once)
+TK_WARNING = getattr(TK, 'common_warning', TK.WARNING)
+TK_SUCCESS = getattr(TK, 'common_success', TK.SUCCESS)
+TK_ERROR = getattr(TK, 'common_error', TK.ERROR)
+TK_INFO = getattr(TK, 'common_info', TK.INFO)
+TK_CONFIRM = getattr(TK, 'common_confirm', TK.CONFIRM)
+TK_ALL = getattr(TK, 'common_all', "Tümü")
+TK_NO_DATA = getattr(TK, 'MSG_NO_DATA_FOUND', 'Geçerli veri bulunamadı!')
+TK_THICKNESS = getattr(TK, 'PARAM_COATING_THICKNESS', 'Film Kalınlığı')
+
+# Formulation codes that are not real saved codes
+_SKIP_CODES = frozenset({'none', 'null', '-', ''})
+_PLACEHOLDER_PREFIXES = ('-V', 'None-')
+_INTERN_MAX_LEN = 64  # Longer strings are not worth interning
+
+# Running summary totals: re-sum the grid after this many row deltas, and treat
+# anything smaller than _TOTALS_EPSILON as zero (float drift from +/- deltas)
+_TOTALS_RESYNC_EVERY = 64
+_TOTALS_EPSILON = 1e-9
+
+
+def _snap_zero(value: float) -> float:
+    """Float drift around zero -> 0.0 (never renders as "-0.00")"""
+    return 0.0 if abs(value) < _TOTALS_EPSILON else value
+
+# Grid data key -> Turkish export header
+_EXPORT_COLUMNS: Dict[str, str] = {
+    'row_num': '#',
+    'material_code': 'Hammadde Kodu',
+    'material_name': 'Hammadde',
+    'weight': 'Miktar (kg)',
+    'solid_pct': 'Katı İçerik %',
+    'solid_weight': 'Katı Kütle (kg)',
+    'unit_price': 'Birim Fiyat (TL)',
+    'total_price': 'Maliyet (TL)',
+}
+
+# Template help text starts with this; such rows are never imported as materials
+_TEMPLATE_NOTE_MARKER = '💡'
+
+# Import column header (lowercased) -> canonical column name
+_COL_ALIAS: Dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in {
+        'material_code': ['raw material code', 'material code', 'hammadde kodu', 'code', 'kod'],
+        'material_name': ['material name', 'hammadde adı', 'hammadde ismi', 'name', 'ad', 'isim'],
+        'quantity': ['quantity (kg)', 'quantity', 'ağırlık (kg)', 'ağırlık', 'miktar (kg)', 'miktar',
+                     'weight', 'amount', 'qty'],
+        'notes': ['notes', 'notlar', 'note', 'not'],
+    }.items()
+    for alias in aliases
+}
+
+
+def _is_import_column(header) -> bool:
+    """Whether a sheet header maps to one of the import columns"""
+    return str(header).lower().strip() in _COL_ALIAS
+
+
+@lru_cache(maxsize=4096)
+def _fmt_display(code: str, name: str) -> str:
+    """Combobox text for a formulation (memoized across list reloads)"""
+    display = f"{code} - {name}" if name else code
+    return sys.intern(display) if len(display) < _INTERN_MAX_LEN else display
+
 
 class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     """
@@ -32,6 +100,8 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     - Scientific column naming
     """
     
+    MATERIALS_CACHE_TTL = 5.0  # seconds
+    
     def __init__(
         self,
         parent,
@@ -41,6 +111,8 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         on_lookup_material: Callable = None,
         on_get_material_list: Callable = None,
         on_create_material: Callable = None,
+        on_lookup_materials_bulk: Callable = None,
+        on_create_materials_bulk: Callable = None,
         **kwargs
     ):
         super().__init__(parent, padding=10, **kwargs)
@@ -50,12 +122,39 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         self.on_load_formulation = on_load_formulation
         self.on_lookup_material = on_lookup_material
         self.on_get_material_list = on_get_material_list
+        # create(code, name) -> created material dict, or a truthy/falsy flag
+        # (legacy); a dict is used as-is, otherwise the material is re-looked up
         self.on_create_material = on_create_material
+        # Optional batch variants: lookup(codes) -> {code: info},
+        # create([(code, name), ...]) -> [created codes]
+        self.on_lookup_materials_bulk = on_lookup_materials_bulk
+        self.on_create_materials_bulk = on_create_materials_bulk
         
         self.current_project = None
         self.current_project_id = None
         self.formulation_list = []
+        self._formulation_index: Dict[str, int] = {}  # display/code -> formulation id
+        # Values last pushed to the comboboxes (skip no-op reassignments)
+        self._last_formulation_values: tuple = ()
+        self._formulation_values_set: frozenset = frozenset()
+        # IDs of the last list passed to load_formulation_list -> (indices, display texts)
+        self._filter_cache_key: Optional[tuple] = None
+        self._filter_cache_result: tuple = ((), ())
+        self._last_project_values: tuple = ()
+        self._project_names_set: frozenset = frozenset()
         self.on_predict = None
+        self._summary_after_id = None  # pending idle summary refresh
+        self._bulk_loading = False  # row change events are ignored while set
+        self._last_summary: Dict[str, str] = {}  # last rendered summary texts
+        self._in_summary = False  # guards _update_summary against re-entry
+        self._last_prediction_text = None
+        # Running totals updated per changed row; None forces a full grid sum
+        self._totals_cache: Optional[Dict] = None
+        self._row_contributions: Dict[str, tuple] = {}
+        self._contributions_complete = False
+        self._deltas_since_sync = 0  # row deltas folded in since the last full sum
+        self._materials_cache: Optional[Tuple[Dict, ...]] = None
+        self._materials_cache_time = 0.0
         
         self.setup_i18n()
         self._create_ui()
@@ -63,12 +162,16 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     
     def _update_texts(self):
         """Update texts for i18n"""
+        project_text = t(TK.FORM_PROJECT)
+        saved_text = t(TK.FORM_SAVED_FORMULAS)
+        predict_text = t(TK.FORM_PREDICT)
+        
         self.config(text=t(TK.FORM_TITLE))
-        self.project_frame.config(text=t(TK.FORM_PROJECT))
-        self.project_label.config(text=f"{t(TK.FORM_PROJECT)}:")
+        self.project_frame.config(text=project_text)
+        self.project_label.config(text=f"{project_text}:")
         self.new_project_btn.config(text=t(TK.NAV_NEW_PROJECT))
-        self.formula_frame.config(text=t(TK.FORM_SAVED_FORMULAS))
-        self.saved_label.config(text=f"{t(TK.FORM_SAVED_FORMULAS)}:")
+        self.formula_frame.config(text=saved_text)
+        self.saved_label.config(text=f"{saved_text}:")
         self.code_label.config(text=f"{t(TK.FORM_CODE)}:")
         self.name_label.config(text=f"{t(TK.FORM_NAME)}:")
         
@@ -88,15 +191,15 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         self.template_btn.config(text=t(TK.FORM_DOWNLOAD_TEMPLATE))
         self.import_btn.config(text=t(TK.FORM_IMPORT))
         self.export_btn.config(text=t(TK.FORM_EXPORT))
-        self.predict_btn.config(text=t(TK.FORM_PREDICT))
+        self.predict_btn.config(text=predict_text)
         self.calc_btn.config(text=t(TK.FORM_CALCULATE))
         self.save_btn.config(text=t(TK.SAVE))
         self.variant_btn.config(text=t(TK.FORM_NEW_VARIATION))
         
         # Prediction
-        self.prediction_frame.config(text=t(TK.FORM_PREDICT))
-        self.thickness_label.config(text=f"{t(TK.PARAM_COATING_THICKNESS if hasattr(TK, 'PARAM_COATING_THICKNESS') else 'Film Kalınlığı')} (µm):")
-        self.predict_now_btn.config(text=t(TK.FORM_PREDICT))
+        self.prediction_frame.config(text=predict_text)
+        self.thickness_label.config(text=f"{t(TK_THICKNESS)} (µm):")
+        self.predict_now_btn.config(text=predict_text)
 
     def _create_ui(self):
         """Create the modern UI layout"""
@@ -146,12 +249,14 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         
         self.code_label = ttk.Label(self.formula_frame)
         self.code_label.pack(side=tk.LEFT)
-        self.formula_code_entry = ttk.Entry(self.formula_frame, width=12)
+        self.formula_code_var = tk.StringVar()
+        self.formula_code_entry = ttk.Entry(self.formula_frame, width=12, textvariable=self.formula_code_var)
         self.formula_code_entry.pack(side=tk.LEFT, padx=5)
         
         self.name_label = ttk.Label(self.formula_frame)
         self.name_label.pack(side=tk.LEFT)
-        self.formula_name_entry = ttk.Entry(self.formula_frame, width=20)
+        self.formula_name_var = tk.StringVar()
+        self.formula_name_entry = ttk.Entry(self.formula_frame, width=20, textvariable=self.formula_name_var)
         self.formula_name_entry.pack(side=tk.LEFT, padx=5)
     
     def _create_grid_section(self):
@@ -237,6 +342,9 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         )
         self.export_btn.pack(side=tk.LEFT, padx=2)
         
+        # Shown while Excel I/O runs on a worker thread
+        self.busy_bar = ttk.Progressbar(left_btns, mode='indeterminate', length=80)
+        
         # Right side - Main actions
         right_btns = ttk.Frame(btn_frame)
         right_btns.pack(side=tk.RIGHT)
@@ -306,8 +414,49 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     # =========================================================================
     
     def _on_row_changed(self, item_id: str):
-        """Handle row data change"""
-        self._update_summary()
+        """Handle row data change (coalesced so a burst of edits refreshes the summary once)"""
+        if self._bulk_loading:
+            return  # Summary is recomputed once when the bulk operation ends
+        self._apply_row_delta(item_id)
+        if not self._summary_after_id:
+            self._summary_after_id = self.after_idle(self._flush_summary)
+    
+    def _flush_summary(self):
+        """Render the running totals once the pending events are processed"""
+        self._summary_after_id = None
+        self._update_summary(full=False)
+    
+    def _apply_row_delta(self, item_id: str):
+        """Fold one row's change into the running totals instead of re-summing the grid"""
+        cache = self._totals_cache
+        if cache is None:
+            return
+        old = self._row_contributions.get(item_id)
+        if old is None:
+            if not self._contributions_complete:
+                self._totals_cache = None  # Row rendered after the last full sum, baseline unknown
+                return
+            old = (0, 0, 0, 0)
+        new = self.grid.get_row_totals(item_id)
+        if new == old:
+            return
+        if new[3]:
+            self._row_contributions[item_id] = new
+        else:
+            self._row_contributions.pop(item_id, None)
+        
+        cache['row_count'] += new[3] - old[3]
+        self._deltas_since_sync += 1
+        if cache['row_count'] <= 0 or self._deltas_since_sync >= _TOTALS_RESYNC_EVERY:
+            # Re-anchor on an exact grid sum so float deltas cannot accumulate
+            self._totals_cache = None
+            return
+        for key, delta in (('total_quantity', new[0] - old[0]),
+                           ('total_solid', new[1] - old[1]),
+                           ('total_cost', new[2] - old[2])):
+            cache[key] = _snap_zero(cache[key] + delta)
+        total_quantity = cache['total_quantity']
+        cache['solid_percent'] = (cache['total_solid'] / total_quantity * 100) if total_quantity > 0 else 0
     
     def _on_project_selected(self, event=None):
         """Handle project selection"""
@@ -322,13 +471,9 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         if not selection or not self.on_load_formulation:
             return
         
-        # Find formulation ID
-        for item in self.formulation_list:
-            if item.get('display') == selection or item.get('formula_code') == selection:
-                formulation_id = item.get('id')
-                if formulation_id:
-                    self._load_formulation_by_id(formulation_id)
-                break
+        formulation_id = self._formulation_index.get(selection)
+        if formulation_id:
+            self._load_formulation_by_id(formulation_id)
     
     def _create_new_project(self):
         """Create new project dialog"""
@@ -350,34 +495,86 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
             return self.on_lookup_material(identifier)
         return None
     
-    def _get_materials(self) -> List[Dict]:
-        """Get all materials"""
-        if self.on_get_material_list:
+    def _get_materials(self) -> Tuple[Dict, ...]:
+        """Get all materials (cached for MATERIALS_CACHE_TTL seconds, as an immutable snapshot)"""
+        if not self.on_get_material_list:
+            return ()
+        now = time.monotonic()
+        if self._materials_cache is None or (now - self._materials_cache_time) > self.MATERIALS_CACHE_TTL:
             try:
-                return self.on_get_material_list()
+                self._materials_cache = tuple(self.on_get_material_list() or ())
             except Exception:
-                pass
-        return []
+                return ()
+            self._materials_cache_time = now
+        return self._materials_cache
     
-    def _update_summary(self):
-        """Update summary labels"""
-        totals = self.grid.get_totals()
+    def _update_summary(self, full: bool = True):
+        """
+        Update summary labels.
         
-        self.summary_labels['total_quantity'].config(
-            text=f"{totals['total_quantity']:.2f} kg"
-        )
-        self.summary_labels['total_solid'].config(
-            text=f"{totals['total_solid']:.2f} kg"
-        )
-        self.summary_labels['solid_percent'].config(
-            text=f"{totals['solid_percent']:.1f}%"
-        )
-        self.summary_labels['total_cost'].config(
-            text=f"{totals['total_cost']:.2f} TL"
-        )
-        self.summary_labels['row_count'].config(
-            text=str(totals['row_count'])
-        )
+        Args:
+            full: Re-sum the whole grid (bulk loads); otherwise use the running totals
+        """
+        if self._in_summary:
+            return  # Nested dispatch; the running call renders the latest totals
+        if self._summary_after_id:
+            self.after_cancel(self._summary_after_id)  # Direct call supersedes the pending one
+            self._summary_after_id = None
+        self._in_summary = True
+        try:
+            if full or self._totals_cache is None:
+                contributions = {}
+                self._totals_cache = self.grid.get_totals(per_row=contributions)
+                self._row_contributions = {k: v for k, v in contributions.items() if v[3]}
+                self._contributions_complete = not self.grid.has_pending_rows()
+                self._deltas_since_sync = 0
+            totals = self._totals_cache
+            
+            new_texts = {
+                'total_quantity': f"{_snap_zero(totals['total_quantity']):.2f} kg",
+                'total_solid': f"{_snap_zero(totals['total_solid']):.2f} kg",
+                'solid_percent': f"{_snap_zero(totals['solid_percent']):.1f}%",
+                'total_cost': f"{_snap_zero(totals['total_cost']):.2f} TL",
+                'row_count': str(totals['row_count']),
+            }
+            for key, text in new_texts.items():
+                if self._last_summary.get(key) != text:
+                    self.summary_labels[key][1].config(text=text)
+                    self._last_summary[key] = text
+        finally:
+            self._in_summary = False
+    
+    def _run_in_background(self, work: Callable, on_done: Callable):
+        """Run blocking file I/O on a worker thread, then call on_done(result, error) on the Tk thread"""
+        self._set_busy(True)
+        
+        def worker():
+            try:
+                result, error = work(), None
+            except Exception as e:
+                result, error = None, e
+            try:
+                self.after(0, self._finish_background, on_done, result, error)
+            except (RuntimeError, tk.TclError):
+                pass  # Editor was destroyed while the job ran
+        
+        threading.Thread(target=worker, daemon=True).start()
+    
+    def _finish_background(self, on_done: Callable, result, error):
+        self._set_busy(False)
+        on_done(result, error)
+    
+    def _set_busy(self, busy: bool):
+        """Show the progress bar and lock the Excel buttons while I/O is running"""
+        state = 'disabled' if busy else 'normal'
+        for btn in (self.template_btn, self.import_btn, self.export_btn):
+            btn.config(state=state)
+        if busy:
+            self.busy_bar.pack(side=tk.LEFT, padx=5)
+            self.busy_bar.start(10)
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.pack_forget()
     
     # =========================================================================
     # ACTIONS
@@ -385,10 +582,10 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     
     def _clear_all(self):
         """Clear all data"""
-        if messagebox.askyesno(t(TK.common_confirm if hasattr(TK, 'common_confirm') else TK.CONFIRM), t(TK.MSG_ARE_YOU_SURE)):
-            self.grid.clear_all()
-            self.formula_code_entry.delete(0, tk.END)
-            self.formula_name_entry.delete(0, tk.END)
+        if messagebox.askyesno(t(TK_CONFIRM), t(TK.MSG_ARE_YOU_SURE)):
+            self._bulk_clear()
+            self.formula_code_var.set('')
+            self.formula_name_var.set('')
             self._update_summary()
     
     def _calculate(self):
@@ -412,8 +609,7 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         new_code = simpledialog.askstring(t(TK.FORM_NEW_VARIATION), f"{t(TK.FORM_NEW_VARIATION)} {t(TK.FORM_CODE)}:", initialvalue=current_code + "-v2")
         
         if new_code:
-            self.formula_code_entry.delete(0, tk.END)
-            self.formula_code_entry.insert(0, new_code)
+            self.formula_code_var.set(new_code)
             self._perform_save(is_new_variation=True)
 
     def _perform_save(self, is_new_variation=False):
@@ -422,14 +618,14 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         formula_name = self.formula_name_entry.get().strip()
         
         if not formula_code:
-            messagebox.showwarning(t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING), t(TK.MSG_ENTER_CODE))
+            messagebox.showwarning(t(TK_WARNING), t(TK.MSG_ENTER_CODE))
             self.formula_code_entry.focus_set()
             return
         
         data = self.get_formulation_data()
         
         if not data.get('components'):
-            messagebox.showwarning(t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING), t(TK.MSG_MIN_ONE_COMPONENT))
+            messagebox.showwarning(t(TK_WARNING), t(TK.MSG_MIN_ONE_COMPONENT))
             return
             
         data['is_new_variation'] = is_new_variation
@@ -437,125 +633,135 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         if self.on_save:
             result = self.on_save(data)
             if result:
-                messagebox.showinfo(t(TK.common_success if hasattr(TK, 'common_success') else TK.SUCCESS), t(TK.MSG_SAVED))
+                self.clear_formulation_cache()  # Saved rows may be edited in place
+                messagebox.showinfo(t(TK_SUCCESS), t(TK.MSG_SAVED))
     
     def _download_template(self):
         """Download Excel template for formulation data entry"""
         file_path = filedialog.asksaveasfilename(
             title=t(TK.FORM_DOWNLOAD_TEMPLATE),
             defaultextension=".xlsx",
-            filetypes=[(t(TK.common_info if hasattr(TK, 'common_info') else TK.INFO), "*.xlsx")],
+            filetypes=[(t(TK_INFO), "*.xlsx")],
             initialfile="formulasyon_sablonu.xlsx"
         )
         
         if not file_path:
             return
         
-        try:
-            import xlsxwriter
-            
-            workbook = xlsxwriter.Workbook(file_path)
-            worksheet = workbook.add_worksheet("Formülasyon")
-            
-            # === FORMATS ===
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#4472C4',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center',
-                'valign': 'vcenter',
-                'text_wrap': True,
-                'locked': True
-            })
-            
-            unlocked_format = workbook.add_format({
-                'locked': False,
-                'border': 1
-            })
-            
-            number_format = workbook.add_format({
-                'locked': False,
-                'border': 1,
-                'num_format': '#,##0.00'
-            })
-            
-            # === COLUMN WIDTHS (4 columns) ===
-            worksheet.set_column('A:A', 20)  # Raw Material Code
-            worksheet.set_column('B:B', 25)  # Material Name
-            worksheet.set_column('C:C', 15)  # Quantity (kg)
-            worksheet.set_column('D:D', 30)  # Notes
-            
-            # === HEADERS (4 columns) ===
-            headers = [
-                ('A1', 'Raw Material Code', 'Veritabanındaki hammadde kodunu giriniz.\nÖrnek: EP01, TIO2, SOLV-001'),
-                ('B1', 'Material Name', 'İsteğe bağlı. Eğer kod yeni ise, bu isim hammaddeyi oluşturmak için kullanılacaktır.\n\nOptional. If the code is new, this name will be used to create it.'),
-                ('C1', 'Quantity (kg)', 'Kilogram cinsinden miktar giriniz.'),
-                ('D1', 'Notes', 'İsteğe bağlı notlar.')
-            ]
-            
-            for cell, text, comment in headers:
-                worksheet.write(cell, text, header_format)
-                worksheet.write_comment(cell, comment, {'visible': False, 'width': 250, 'height': 80})
-            
-            # === DATA VALIDATION (Quantity > 0) ===
-            worksheet.data_validation('C2:C1000', {
-                'validate': 'decimal',
-                'criteria': '>',
-                'value': 0,
-                'error_message': f"{t(TK.FORM_QUANTITY)} 0'dan büyük bir sayı olmalıdır.",
-                'error_title': t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING)
-            })
-            
-            # === FORMAT DATA CELLS ===
-            for row in range(1, 101):  # Pre-format first 100 rows
-                worksheet.write_blank(row, 0, None, unlocked_format)  # Material Code
-                worksheet.write_blank(row, 1, None, unlocked_format)  # Material Name
-                worksheet.write_blank(row, 2, None, number_format)    # Quantity
-                worksheet.write_blank(row, 3, None, unlocked_format)  # Notes
-            
-            # === PROTECT WORKSHEET ===
-            worksheet.protect('', {
-                'format_cells': False,
-                'format_columns': False,
-                'format_rows': False,
-                'insert_columns': False,
-                'insert_rows': True,
-                'insert_hyperlinks': False,
-                'delete_columns': False,
-                'delete_rows': True,
-                'select_locked_cells': True,
-                'sort': True,
-                'autofilter': True,
-                'pivot_tables': False,
-                'select_unlocked_cells': True
-            })
-            
-            # === ADD INSTRUCTIONS ===
-            instructions_format = workbook.add_format({
-                'italic': True,
-                'font_color': '#666666',
-                'font_size': 9
-            })
-            worksheet.write('A102', '💡 Hammadde Kodu giriniz. Yeni kodlar otomatik olarak veritabanına eklenecektir.', instructions_format)
-            
-            workbook.close()
-            
-            messagebox.showinfo(
-                t(TK.common_success if hasattr(TK, 'common_success') else TK.SUCCESS), 
-                f"{t(TK.FORM_DOWNLOAD_TEMPLATE)} {t(TK.MSG_SAVED)}:\n{file_path}\n\n"
-                f"{t(TK.FORM_IMPORT)} {t(TK.common_info if hasattr(TK, 'common_info') else TK.INFO)}.\n\n"
-                f"NOT: {t(TK.MSG_AUTO_ADD_MATERIALS)}"
-            )
-            
-        except ImportError:
-            messagebox.showerror(
-                "Hata", 
-                "xlsxwriter kütüphanesi bulunamadı.\n\n"
-                "Kurulum: pip install xlsxwriter"
-            )
-        except Exception as e:
-            messagebox.showerror("Hata", f"Şablon oluşturma hatası:\n{e}")
+        # Resolve texts on the Tk thread; the workbook is written by a worker
+        error_message = f"{t(TK.FORM_QUANTITY)} 0'dan büyük bir sayı olmalıdır."
+        error_title = t(TK_WARNING)
+        
+        def done(_, error):
+            if error is None:
+                messagebox.showinfo(
+                    t(TK_SUCCESS), 
+                    f"{t(TK.FORM_DOWNLOAD_TEMPLATE)} {t(TK.MSG_SAVED)}:\n{file_path}\n\n"
+                    f"{t(TK.FORM_IMPORT)} {t(TK_INFO)}.\n\n"
+                    f"NOT: {t(TK.MSG_AUTO_ADD_MATERIALS)}"
+                )
+            elif isinstance(error, ImportError):
+                messagebox.showerror(
+                    "Hata", 
+                    "xlsxwriter kütüphanesi bulunamadı.\n\n"
+                    "Kurulum: pip install xlsxwriter"
+                )
+            else:
+                messagebox.showerror("Hata", f"Şablon oluşturma hatası:\n{error}")
+        
+        self._run_in_background(
+            lambda: self._write_template(file_path, error_message, error_title), done
+        )
+    
+    @staticmethod
+    def _write_template(file_path: str, error_message: str, error_title: str):
+        """Write the formulation template workbook (runs on a worker thread)"""
+        import xlsxwriter
+        
+        # Stream rows to disk; each sheet is written top to bottom
+        workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+        worksheet = workbook.add_worksheet("Formülasyon")
+        
+        # === FORMATS ===
+        header_format = workbook.add_format({
+            'bold': True,
+            'bg_color': '#4472C4',
+            'font_color': 'white',
+            'border': 1,
+            'align': 'center',
+            'valign': 'vcenter',
+            'text_wrap': True,
+            'locked': True
+        })
+        
+        unlocked_format = workbook.add_format({
+            'locked': False,
+            'border': 1
+        })
+        
+        number_format = workbook.add_format({
+            'locked': False,
+            'border': 1,
+            'num_format': '#,##0.00'
+        })
+        
+        # === COLUMN WIDTHS & DATA CELL FORMATS (4 columns) ===
+        worksheet.set_column('A:A', 20, unlocked_format)  # Raw Material Code
+        worksheet.set_column('B:B', 25, unlocked_format)  # Material Name
+        worksheet.set_column('C:C', 15, number_format)    # Quantity (kg)
+        worksheet.set_column('D:D', 30, unlocked_format)  # Notes
+        
+        # === HEADERS (4 columns) ===
+        headers = [
+            ('A1', 'Raw Material Code', 'Veritabanındaki hammadde kodunu giriniz.\nÖrnek: EP01, TIO2, SOLV-001'),
+            ('B1', 'Material Name', 'İsteğe bağlı. Eğer kod yeni ise, bu isim hammaddeyi oluşturmak için kullanılacaktır.\n\nOptional. If the code is new, this name will be used to create it.'),
+            ('C1', 'Quantity (kg)', 'Kilogram cinsinden miktar giriniz.'),
+            ('D1', 'Notes', 'İsteğe bağlı notlar.')
+        ]
+        
+        for cell, text, comment in headers:
+            worksheet.write(cell, text, header_format)
+            worksheet.write_comment(cell, comment, {'visible': False, 'width': 250, 'height': 80})
+        
+        # === DATA VALIDATION (Quantity > 0) ===
+        worksheet.data_validation('C2:C1000', {
+            'validate': 'decimal',
+            'criteria': '>',
+            'value': 0,
+            'error_message': error_message,
+            'error_title': error_title
+        })
+        
+        # === PROTECT WORKSHEET ===
+        worksheet.protect('', {
+            'format_cells': False,
+            'format_columns': False,
+            'format_rows': False,
+            'insert_columns': False,
+            'insert_rows': True,
+            'insert_hyperlinks': False,
+            'delete_columns': False,
+            'delete_rows': True,
+            'select_locked_cells': True,
+            'sort': True,
+            'autofilter': True,
+            'pivot_tables': False,
+            'select_unlocked_cells': True
+        })
+        
+        # === ADD INSTRUCTIONS ===
+        # On their own sheet: the import reads the first sheet, so help text
+        # in the code column would be created as a material
+        instructions_format = workbook.add_format({
+            'italic': True,
+            'font_color': '#666666',
+            'font_size': 9
+        })
+        notes_sheet = workbook.add_worksheet("Talimatlar")
+        notes_sheet.set_column('A:A', 90)
+        notes_sheet.write('A1', f'{_TEMPLATE_NOTE_MARKER} Hammadde Kodu giriniz. Yeni kodlar otomatik olarak veritabanına eklenecektir.', instructions_format)
+        
+        workbook.close()
 
     def _load_from_excel(self):
         """Load from Excel file"""
@@ -564,7 +770,7 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
             filetypes=[
                 ("Excel", "*.xlsx *.xls"),
                 ("CSV", "*.csv"),
-                (t(TK.common_all if hasattr(TK, 'common_all') else "Tümü"), "*.*")
+                (t(TK_ALL), "*.*")
             ]
         )
         
@@ -582,90 +788,147 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
            B. If not, create it with default values
            C. Get properties and add to grid
         3. Show feedback about newly created materials
+        
+        The file is parsed on a worker thread; steps 2-3 run on the Tk thread.
+        
+        Optional: python-calamine (pandas >= 2.2) parses .xlsx much faster
+        than openpyxl and is used when installed; otherwise the default
+        engine is used.
         """
+        self._run_in_background(lambda: self._read_sheet(file_path), self._finish_import)
+    
+    @staticmethod
+    def _read_sheet(file_path: str):
+        """Parse an import file, preferring the faster calamine/pyarrow readers"""
+        import pandas as pd
+        
+        if file_path.lower().endswith('.csv'):
+            try:
+                return pd.read_csv(file_path, engine='pyarrow')
+            except ImportError:
+                return pd.read_csv(file_path)
+        # Parse only the columns the import understands
+        usecols = _is_import_column
+        try:
+            return pd.read_excel(file_path, sheet_name=0, engine='calamine', usecols=usecols)
+        except (ImportError, ValueError):
+            # python-calamine not installed or pandas too old for the engine
+            return pd.read_excel(file_path, sheet_name=0, usecols=usecols)
+    
+    def _finish_import(self, df, error: Optional[Exception]):
+        """Resolve materials for a parsed import sheet and load it into the grid"""
+        if error is not None:
+            messagebox.showerror(t(TK_ERROR), f"{t(TK.MSG_LOAD_ERROR)}:\n{error}")
+            return
+        
         try:
             import pandas as pd
             
-            df = pd.read_excel(file_path, sheet_name=0)
-            
             if df.empty:
-                messagebox.showwarning(t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING), t(TK.MSG_EMPTY_FILE))
+                messagebox.showwarning(t(TK_WARNING), t(TK.MSG_EMPTY_FILE))
                 return
             
             # Normalize columns - handle template and legacy formats
             col_map = {}
             for col in df.columns:
-                col_lower = str(col).lower().strip()
-                
-                # New 4-column format
-                if col_lower in ['material code', 'hammadde kodu', 'material code', 'code', 'kod']:
-                    col_map[col] = 'material_code'
-                elif col_lower in ['material name', 'hammadde adı', 'hammadde ismi', 'name', 'ad', 'isim']:
-                    col_map[col] = 'material_name'
-                elif col_lower in ['quantity (kg)', 'quantity', 'ağırlık (kg)', 'ağırlık', 'miktar (kg)', 'miktar', 'weight', 'amount', 'qty']:
-                    col_map[col] = 'quantity'
-                elif col_lower in ['notes', 'notlar', 'note', 'not']:
-                    col_map[col] = 'notes'
+                canonical = _COL_ALIAS.get(str(col).lower().strip())
+                if canonical:
+                    col_map[col] = canonical
             
             df = df.rename(columns=col_map)
             
+            # Keep only the known columns (first one wins if aliases repeat);
+            # missing ones are added as empty
+            df = df.loc[:, ~df.columns.duplicated()]
+            df = df.reindex(columns=['material_code', 'material_name', 'quantity', 'notes'])
+            
+            # Clean whole columns at once
+            codes = df['material_code'].astype('string').str.strip().fillna('')
+            # Material code is required; help rows of older templates are skipped
+            keep = (codes.str.len() > 0) & ~codes.str.startswith(_TEMPLATE_NOTE_MARKER)
+            df = df[keep]
+            codes = codes[keep]
+            names = df['material_name'].astype('string').str.strip().fillna('')
+            quantities = pd.to_numeric(df['quantity'], errors='coerce').fillna(0.0)
+            
             # Track created materials and grid data
             data = []
             created_materials = []  # New materials created on-the-fly
-            processed_codes = set()  # Track codes within this import to avoid duplicate creation attempts
+            processed_codes = set()  # Normalized codes already created/resolved in this import
+            # Plain Python tuples: no per-row pandas objects or numpy scalars
+            rows = list(zip(codes.tolist(), names.tolist(), quantities.astype('float64').tolist()))
             
-            for _, row in df.iterrows():
-                # Step 1: Extract material code (required)
-                material_code = ''
-                if 'material_code' in df.columns:
-                    raw_code = row.get('material_code', '')
-                    if pd.notna(raw_code):
-                        material_code = str(raw_code).strip()
-                
-                if not material_code:
-                    continue
-                
-                # Step 2: Extract material name (optional, used for new materials)
-                material_name = ''
-                if 'material_name' in df.columns:
-                    raw_name = row.get('material_name', '')
-                    if pd.notna(raw_name):
-                        material_name = str(raw_name).strip()
-                
-                # Step 3: Extract quantity
-                quantity = 0
-                try:
-                    qty_val = row.get('quantity', 0)
-                    if pd.notna(qty_val):
-                        quantity = float(qty_val)
-                except (ValueError, TypeError):
-                    pass
+            # Normalized code -> material info; "EP01" and "ep01 " resolve once
+            lookup_cache: Dict[str, Optional[Dict]] = {}
+            # Normalized code -> (code, name, solid_content, unit_price) with defaults applied
+            resolved_cache: Dict[str, tuple] = {}
+            
+            # Resolve all codes in one round trip when the bulk callbacks are wired
+            if self.on_lookup_materials_bulk:
+                first_seen = {}  # normalized -> (code as written, name)
+                for code, name, _ in rows:
+                    first_seen.setdefault(code.upper(), (code, name))
+                found = self.on_lookup_materials_bulk([code for code, _ in first_seen.values()]) or {}
+                lookup_cache.update((str(code).strip().upper(), info) for code, info in found.items())
+                missing = {code: name if name else code
+                           for norm, (code, name) in first_seen.items() if not lookup_cache.get(norm)}
+                if missing and (self.on_create_materials_bulk or self.on_create_material):
+                    if self.on_create_materials_bulk:
+                        created_materials.extend(self.on_create_materials_bulk(list(missing.items())) or [])
+                    else:
+                        # No batch create wired: create one by one, still re-query in one call
+                        for code, name in list(missing.items()):
+                            result = self.on_create_material(code, name)
+                            if isinstance(result, dict):
+                                lookup_cache[code.upper()] = result
+                                del missing[code]
+                            if result:
+                                created_materials.append(code)
+                    if missing:
+                        found = self.on_lookup_materials_bulk(list(missing)) or {}
+                        lookup_cache.update((str(code).strip().upper(), info) for code, info in found.items())
+                processed_codes.update(first_seen)
+            
+            for material_code, material_name, quantity in rows:
+                normalized = material_code.upper()  # already stripped
                 
                 # Step A: Check if material exists in DB
-                material_info = None
-                if self.on_lookup_material:
-                    material_info = self.on_lookup_material(material_code)
-                
-                # Step B: Handle missing materials - Create on-the-fly
-                if not material_info:
-                    if self.on_create_material and material_code not in processed_codes:
+                if normalized in processed_codes:
+                    material_info = lookup_cache.get(normalized)
+                else:
+                    material_info = None
+                    if self.on_lookup_material:
+                        material_info = self.on_lookup_material(material_code)
+                    
+                    # Step B: Handle missing materials - Create on-the-fly
+                    if not material_info and self.on_create_material:
                         # Create new material with defaults
                         name_for_new = material_name if material_name else material_code
-                        was_created = self.on_create_material(material_code, name_for_new)
+                        result = self.on_create_material(material_code, name_for_new)
                         
-                        if was_created:
+                        if result:
                             created_materials.append(material_code)
                         
-                        # Re-lookup to get the material info
-                        material_info = self.on_lookup_material(material_code)
-                        processed_codes.add(material_code)
+                        if isinstance(result, dict):
+                            material_info = result
+                        elif self.on_lookup_material:
+                            # Legacy flag result: re-lookup to get the material info
+                            material_info = self.on_lookup_material(material_code)
+                    
+                    lookup_cache[normalized] = material_info
+                    processed_codes.add(normalized)
                 
                 # Step C: Add to formulation data
                 if material_info:
-                    resolved_name = material_info.get('name', material_code)
-                    resolved_code = material_info.get('code', material_code)
-                    solid_content = material_info.get('solid_content', 100) or 100
-                    unit_price = material_info.get('unit_price', 0) or 0
+                    resolved = resolved_cache.get(normalized)
+                    if resolved is None:
+                        resolved = resolved_cache[normalized] = (
+                            material_info.get('code', material_code),
+                            material_info.get('name', material_code),
+                            material_info.get('solid_content', 100) or 100,
+                            material_info.get('unit_price', 0) or 0,
+                        )
+                    resolved_code, resolved_name, solid_content, unit_price = resolved
                 else:
                     # Fallback if still not found (shouldn't happen)
                     resolved_name = material_name if material_name else material_code
@@ -681,27 +944,30 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
                     'unit_price': unit_price,
                 })
             
+            if created_materials:
+                self.invalidate_materials_cache()
+            
             if data:
-                self.grid.load_data(data)
+                self._bulk_load(data)
                 self._update_summary()
                 
                 # User feedback
                 if created_materials:
                     messagebox.showinfo(
-                        t(TK.common_success if hasattr(TK, 'common_success') else TK.SUCCESS),
-                        f"{t(TK.MSG_LINES_LOADED).replace('{count}', str(len(data)))}\n\n"
+                        t(TK_SUCCESS),
+                        f"{t(TK.MSG_LINES_LOADED, count=len(data))}\n\n"
                         f"🆕 {t(TK.MSG_AUTO_ADD_MATERIALS)} "
                         f"(0, 100%).\n\n" +
                         "\n".join(f"• {code}" for code in created_materials[:10]) +
                         (f"\n... ve {len(created_materials) - 10} diğer" if len(created_materials) > 10 else "")
                     )
                 else:
-                    messagebox.showinfo(t(TK.common_success if hasattr(TK, 'common_success') else TK.SUCCESS), t(TK.MSG_LINES_LOADED).replace('{count}', str(len(data))))
+                    messagebox.showinfo(t(TK_SUCCESS), t(TK.MSG_LINES_LOADED, count=len(data)))
             else:
-                messagebox.showwarning(t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING), t(TK.MSG_NO_DATA_FOUND if hasattr(TK, 'MSG_NO_DATA_FOUND') else 'Geçerli veri bulunamadı!'))
+                messagebox.showwarning(t(TK_WARNING), t(TK_NO_DATA))
                 
         except Exception as e:
-            messagebox.showerror(t(TK.common_error if hasattr(TK, 'common_error') else TK.ERROR), f"{t(TK.MSG_LOAD_ERROR)}:\n{e}")
+            messagebox.showerror(t(TK_ERROR), f"{t(TK.MSG_LOAD_ERROR)}:\n{e}")
     
     def _export_to_excel(self):
         """Export to Excel file"""
@@ -711,29 +977,47 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
             filetypes=[("Excel", "*.xlsx")]
         )
         
-        if file_path:
+        if not file_path:
+            return
+        
+        data = self.grid.get_data()  # Read the grid on the Tk thread
+        
+        def write():
+            keys = list(_EXPORT_COLUMNS)
             try:
-                import pandas as pd
+                import xlsxwriter
+            except ImportError:
+                # xlsxwriter not installed: openpyxl streaming writer
+                from openpyxl import Workbook
                 
-                data = self.grid.get_data()
-                df = pd.DataFrame(data)
-                
-                # Rename columns to Turkish
-                df = df.rename(columns={
-                    'row_num': '#',
-                    'material': 'Hammadde',
-                    'quantity': 'Miktar (kg)',
-                    'weight_pct': 'Ağırlık %',
-                    'solid_content': 'Katı İçerik %',
-                    'solid_mass': 'Katı Kütle (kg)',
-                    'cost': 'Maliyet (TL)'
-                })
-                
-                df.to_excel(file_path, index=False)
+                workbook = Workbook(write_only=True)
+                worksheet = workbook.create_sheet('Formülasyon')
+                worksheet.append(list(_EXPORT_COLUMNS.values()))
+                for row in data:
+                    worksheet.append([row.get(key) for key in keys])
+                workbook.save(file_path)
+                return
+            
+            workbook = xlsxwriter.Workbook(file_path, {'constant_memory': True})
+            worksheet = workbook.add_worksheet('Formülasyon')
+            worksheet.write_row(0, 0, list(_EXPORT_COLUMNS.values()))
+            for row_idx, row in enumerate(data, 1):
+                worksheet.write_row(row_idx, 0, [row.get(key) for key in keys])
+            workbook.close()
+        
+        def done(_, error):
+            if error is None:
                 messagebox.showinfo("Başarılı", f"Excel dosyası kaydedildi:\n{file_path}")
-                
-            except Exception as e:
-                messagebox.showerror("Hata", f"Excel yazma hatası:\n{e}")
+            elif isinstance(error, ImportError):
+                messagebox.showerror(
+                    "Hata", 
+                    "Excel kütüphanesi bulunamadı.\n\n"
+                    "Kurulum: pip install xlsxwriter"
+                )
+            else:
+                messagebox.showerror("Hata", f"Excel yazma hatası:\n{error}")
+        
+        self._run_in_background(write, done)
     
     def _predict_results(self):
         """Predict test results"""
@@ -744,7 +1028,7 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         formulation_data = self.get_formulation_data()
         
         if not formulation_data.get('components'):
-            messagebox.showwarning(t(TK.common_warning if hasattr(TK, 'common_warning') else TK.WARNING), t(TK.MSG_MIN_ONE_COMPONENT_PREDICT))
+            messagebox.showwarning(t(TK_WARNING), t(TK.MSG_MIN_ONE_COMPONENT_PREDICT))
             return
         
         try:
@@ -758,25 +1042,41 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
     
     def _display_prediction(self, result: Dict):
         """Display prediction results"""
-        self.prediction_text.config(state='normal')
-        self.prediction_text.delete(1.0, tk.END)
-        
         if result and result.get('success'):
             predictions = result.get('predictions', {})
-            
-            lines = [f"🔮 {t(TK.ML_FEATURE_IMPORTANCE)}", "─" * 40]
-            
-            for key, value in predictions.items():
-                if value is not None:
-                    lines.append(f"  {key}: {value:.2f}")
-            
-            self.prediction_text.insert(tk.END, "\n".join(lines))
+            body = "\n".join(f"  {key}: {value:.2f}" for key, value in predictions.items() if value is not None)
+            content = f"🔮 {t(TK.ML_FEATURE_IMPORTANCE)}\n{'─' * 40}\n{body}"
         else:
             message = result.get('message', 'Tahmin yapılamadı') if result else 'Tahmin yapılamadı'
-            self.prediction_text.insert(tk.END, f"❌ {message}")
+            content = f"❌ {message}"
+        
+        if content == self._last_prediction_text:
+            return  # Same result as shown, skip the Text round-trip
+        self._last_prediction_text = content
         
+        self.prediction_text.config(state='normal')
+        self.prediction_text.delete(1.0, tk.END)
+        self.prediction_text.insert(tk.END, content)
         self.prediction_text.config(state='disabled')
     
+    def _bulk_clear(self):
+        """Clear the grid without per-row summary updates"""
+        self._bulk_loading = True
+        try:
+            self.grid.clear_all()
+        finally:
+            self._bulk_loading = False
+    
+    def _bulk_load(self, rows: List[Dict]):
+        """Load rows into the grid with a single layout pass"""
+        self._bulk_loading = True
+        self.grid.begin_bulk_update()
+        try:
+            self.grid.load_data(rows)
+        finally:
+            self.grid.end_bulk_update()
+            self._bulk_loading = False
+    
     def _load_formulation_by_id(self, formulation_id: int):
         """Load formulation by ID"""
         if self.on_load_formulation:
@@ -809,18 +1109,13 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
             formula_code = data.get('formula_code') or data.get('trial_code') or ''
             formula_name = data.get('formula_name') or data.get('concept_name') or ''
             
-            self.formula_code_entry.delete(0, tk.END)
-            if formula_code:  # Only insert if there's a value
-                self.formula_code_entry.insert(0, str(formula_code))
-            
-            self.formula_name_entry.delete(0, tk.END)
-            if formula_name:  # Only insert if there's a value
-                self.formula_name_entry.insert(0, str(formula_name))
+            self._set_var_if_changed(self.formula_code_var, formula_code)
+            self._set_var_if_changed(self.formula_name_var, formula_name)
             
             # Load components
             components = data.get('components', data.get('materials', []))
             if components:
-                self.grid.load_data(components)
+                self._bulk_load(components)
             
             self._update_summary()
             
@@ -828,15 +1123,25 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
             logger.error(f"Error loading formulation: {e}")
             # Don't propagate error - just log it
     
+    @staticmethod
+    def _set_var_if_changed(var: tk.StringVar, value):
+        """Write an entry's variable only when the text differs (skips the entry redraw)"""
+        value = str(value) if value else ''
+        if var.get() != value:
+            var.set(value)
+    
     def load_projects(self, projects: List):
         """Load projects into dropdown"""
         if isinstance(projects, list):
             if projects and isinstance(projects[0], dict):
-                names = [p.get('name', '') for p in projects if p.get('name')]
+                names = tuple(p['name'] for p in projects if p.get('name'))
             else:
-                names = [p for p in projects if p]  # Filter empty strings
+                names = tuple(p for p in projects if p)  # Filter empty strings
             
-            self.project_combo['values'] = names
+            if names != self._last_project_values:
+                self.project_combo['values'] = names
+                self._last_project_values = names
+                self._project_names_set = frozenset(names)
     
     def load_formulation_list(self, formulations: List):
         """
@@ -847,45 +1152,108 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         - Entries without valid formula_code
         - Entries with 'None' or placeholder codes
         """
-        self.formulation_list = []
-        display_values = []
+        # Same formulation IDs in the same order as last time: reuse the filter result.
+        # Callers must call clear_formulation_cache() when codes or names change.
+        cache_key = tuple(f.get('id') for f in formulations)
+        if cache_key == self._filter_cache_key:
+            indices, display_values = self._filter_cache_result
+        else:
+            indices, display_values = self._filter_formulations(formulations)
+            self._filter_cache_key = cache_key
+            self._filter_cache_result = (indices, display_values)
         
-        for f in formulations:
+        valid = []
+        for i, display in zip(indices, display_values):
+            f = formulations[i]
+            f['display'] = display
+            valid.append(f)
+        
+        self.set_formulation_list(valid)
+        new_values = tuple(display_values)
+        if new_values != self._last_formulation_values:
+            self.formulation_combo['values'] = new_values
+            self._last_formulation_values = new_values
+            self._formulation_values_set = frozenset(new_values)
+        
+        # Clear current selection if it's no longer valid
+        current = self.formulation_combo.get()
+        if current and current not in self._formulation_values_set:
+            self.formulation_combo.set('')
+        
+        logger.debug(f"Loaded {len(display_values)} valid formulations (filtered from {len(formulations)})")
+    
+    def clear_formulation_cache(self):
+        """Forget the last filter result so the next load re-filters"""
+        self._filter_cache_key = None
+        self._filter_cache_result = ((), ())
+    
+    @staticmethod
+    def _filter_formulations(formulations: List) -> tuple:
+        """Return (indices, display texts) of the valid, saved formulations"""
+        indices = []
+        display_values = []
+        # Loop-invariant lookups bound to locals
+        idx_append = indices.append
+        dv_append = display_values.append
+        skip_codes = _SKIP_CODES
+        placeholder_prefixes = _PLACEHOLDER_PREFIXES
+        intern = sys.intern
+        fmt_display = _fmt_display
+        
+        for i, f in enumerate(formulations):
             # FILTER 1: Must have valid ID (saved to DB)
             fid = f.get('id')
             if not fid or fid == 'None':
                 continue
             
             # FILTER 2: Must have valid formula_code
-            code = f.get('formula_code') or f.get('trial_code') or ''
-            code = str(code).strip()
+            code = f.get('formula_code')
+            if not code:
+                code = f.get('trial_code') or ''
+            if type(code) is not str:
+                code = str(code)
+            code = code.strip()
             
             # FILTER 3: Skip None, empty, or placeholder codes
-            if not code or code.lower() in ['none', 'null', '-', '']:
+            if not code or code.lower() in skip_codes:
                 continue
             
             # FILTER 4: Skip codes that look like auto-generated placeholders
-            if code.startswith('-V') or code.startswith('None-'):
+            if code.startswith(placeholder_prefixes):
                 continue
             
             # Valid entry - add to list
-            name = f.get('formula_name') or f.get('concept_name') or ''
-            name = str(name).strip() if name else ''
+            name = f.get('formula_name')
+            if not name:
+                name = f.get('concept_name') or ''
+            if name:
+                if type(name) is not str:
+                    name = str(name)
+                name = name.strip()
             
-            display = f"{code} - {name}" if name else code
-            f['display'] = display
+            # Codes/names repeat across reloads; share one object per value
+            if len(code) < _INTERN_MAX_LEN:
+                code = intern(code)
+            if name and len(name) < _INTERN_MAX_LEN:
+                name = intern(name)
             
-            self.formulation_list.append(f)
-            display_values.append(display)
-        
-        self.formulation_combo['values'] = display_values
+            idx_append(i)
+            dv_append(fmt_display(code, name))
         
-        # Clear current selection if it's no longer valid
-        current = self.formulation_combo.get()
-        if current and current not in display_values:
-            self.formulation_combo.set('')
-        
-        logger.debug(f"Loaded {len(display_values)} valid formulations (filtered from {len(formulations)})")
+        return indices, display_values
+    
+    def set_formulation_list(self, items: List[Dict]):
+        """Set the loaded formulations and index them by display text and code"""
+        self.formulation_list = items
+        index = {}
+        for item in items:
+            fid = item.get('id')
+            if not fid:
+                continue
+            for key in (item.get('display'), item.get('formula_code')):
+                if key:
+                    index.setdefault(key, fid)  # First match wins, as in list order
+        self._formulation_index = index
     
     def _clear_form(self):
         """
@@ -898,11 +1266,11 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         - Keeps project selection
         """
         # Clear formula fields
-        self.formula_code_entry.delete(0, tk.END)
-        self.formula_name_entry.delete(0, tk.END)
+        self.formula_code_var.set('')
+        self.formula_name_var.set('')
         
         # Clear grid
-        self.grid.clear_all()
+        self._bulk_clear()
         
         # Update summary
         self._update_summary()
@@ -934,9 +1302,17 @@ class ModernFormulationEditor(ttk.LabelFrame, I18nMixin):
         self.current_project = project_name
         
         # Update ComboBox selection
-        if project_name and project_name in self.project_combo['values']:
+        if project_name and project_name in self._project_names_set:
             self.project_combo.set(project_name)
     
+    def invalidate_materials_cache(self):
+        """Drop the cached material list (call after materials are created or edited)"""
+        self._materials_cache = None
+    
+    def refresh_materials(self):
+        """Material list changed elsewhere in the app"""
+        self.invalidate_materials_cache()
+    
     def set_prediction_callback(self, callback: Callable):
         """Set prediction callback"""
         self.on_predict = callback
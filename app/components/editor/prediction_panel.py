@@ -6,12 +6,46 @@ ML tahmin sonuçları gösterim bileşeni
 
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable, Dict, Optional
-import threading
+from typing import Callable, Dict, List, Optional
+from collections import OrderedDict
 import logging
 
 logger = logging.getLogger(__name__)
 
+_PREDICT_CACHE_SIZE = 64  # Saklanan en fazla tahmin sonucu
+
+_CONF_BAR_LENGTH = 20
+# Olası tüm güven bar'ları (0-20 dolu hücre)
+_CONF_BARS = tuple(
+    "█" * filled + "░" * (_CONF_BAR_LENGTH - filled)
+    for filled in range(_CONF_BAR_LENGTH + 1)
+)
+
+_SEP_EQ = "=" * 40
+_SEP_DASH = "-" * 40
+
+_HEADER_TMPL = "📊 Kaplama Kalınlığı: {} µm\n"
+# (tahmin anahtarı, etiket, değer biçimi) - gösterim sırası
+_PRED_SCHEMA = (
+    ('film_thickness', "🎯 Film Kalınlığı", "{:.1f} µm"),
+    ('opacity', "🎨 Örtücülük", "{:.1f}%"),
+    ('gloss', "✨ Parlaklık", "{:.1f} GU"),
+    ('gloss_60', "✨ Parlaklık (60°)", "{:.1f} GU"),  # yalnızca 'gloss' yoksa
+    ('hardness', "💎 Sertlik", "{:.1f}"),
+    ('adhesion', "🔗 Yapışma", "{:.1f}/5"),
+    ('corrosion_resistance', "🛡️ Korozyon Direnci", "{:.1f}"),
+)
+
+
+def _components_key(components: List[Dict]) -> tuple:
+    """Tahmini belirleyen bileşen alanları: (kod, miktar, katı içerik) satır sırasıyla"""
+    return tuple(
+        (c.get('material_code', c.get('code')),
+         c.get('weight', c.get('amount')),
+         c.get('solid_pct', c.get('solid_content')))
+        for c in components
+    )
+
 
 class PredictionPanel(ttk.LabelFrame):
     """
@@ -21,16 +55,27 @@ class PredictionPanel(ttk.LabelFrame):
     ve kullanıcıya gösterir.
     """
     
-    def __init__(self, parent, on_predict: Callable = None):
+    def __init__(self, parent, on_predict: Callable = None, get_components: Callable = None):
         """
         Args:
             parent: Üst widget
-            on_predict: Tahmin callback'i (formulation_data) -> Dict
+            on_predict: Tahmin callback'i (thickness) -> Dict
+            get_components: Güncel bileşenleri döndüren callback () -> List[Dict].
+                Verilirse aynı bileşenler ve kalınlık için sonuç önbellekten gelir.
         """
         super().__init__(parent, text="🔮 Muhtemel Test Sonuçları (Tahmin)", padding=10)
         
         self.on_predict = on_predict
+        self.get_components = get_components
         self.is_predicting = False
+        self._gen = 0  # tahmin kuşağı; artırılınca süren tahminin sonucu yok sayılır
+        self._pending_after_id = None  # bekleyen (debounce) tahmin isteği
+        self._last_lines: List[str] = []  # sonuç alanında gösterilen satırlar
+        # Tahmin thread'i ve (kuşak, kalınlık) kuyruğu ilk tahminde oluşturulur
+        self._jobs = None
+        self._worker = None
+        # (kalınlık, bileşen anahtarı) -> tahmin sonucu, en son kullanılan sonda
+        self._predict_cache: OrderedDict = OrderedDict()
         
         self._create_widgets()
     
@@ -45,6 +90,8 @@ class PredictionPanel(ttk.LabelFrame):
         self.thickness_var = tk.StringVar(value="50")
         self.thickness_entry = ttk.Entry(control_frame, textvariable=self.thickness_var, width=8)
         self.thickness_entry.pack(side=tk.LEFT, padx=5)
+        # Kalınlık değişince süren tahminin sonucu artık geçersiz
+        self.thickness_var.trace_add('write', lambda *_: self._cancel_prediction())
         
         self.predict_btn = ttk.Button(
             control_frame,
@@ -81,7 +128,14 @@ class PredictionPanel(ttk.LabelFrame):
                         "Tahmin yapmak için 'Tahmin Yap' butonuna tıklayın.")
     
     def _do_predict(self):
+        """Tahmin isteği - art arda tıklamalar tek tahminde birleştirilir"""
+        if self._pending_after_id is not None:
+            self.after_cancel(self._pending_after_id)
+        self._pending_after_id = self.after(200, self._really_predict)
+    
+    def _really_predict(self):
         """Tahmin işlemini başlat"""
+        self._pending_after_id = None
         if self.is_predicting:
             return
         
@@ -89,39 +143,97 @@ class PredictionPanel(ttk.LabelFrame):
             self._set_result("⚠️ Tahmin servisi yapılandırılmamış.")
             return
         
+        try:
+            thickness = float(self.thickness_var.get() or 50)
+        except ValueError:
+            self._on_prediction_error("Geçersiz kalınlık değeri")
+            return
+        
         self.is_predicting = True
+        self._gen += 1
+        gen = self._gen
         self._set_status("processing")
+        
+        key = self._cache_key(thickness)
+        if key is not None and key in self._predict_cache:
+            # Aynı formülasyon ve kalınlık: modeli yeniden çalıştırma
+            self._predict_cache.move_to_end(key)
+            self.after(0, self._on_prediction_complete, self._predict_cache[key], thickness, gen)
+            return
+        
         self._set_result("⏳ Tahmin hesaplanıyor...")
         
         # Arka planda çalıştır
-        threading.Thread(
-            target=self._run_prediction,
-            daemon=True
-        ).start()
+        if self._worker is None:
+            self._start_worker()
+        self._jobs.put((gen, thickness, key))
+    
+    def _start_worker(self):
+        """Tahmin thread'ini başlat (threading/queue yalnızca burada yüklenir)"""
+        import queue
+        import threading
+        
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+    
+    def _cache_key(self, thickness: float) -> Optional[tuple]:
+        """Tahmin önbelleği anahtarı (bileşenler bilinmiyorsa None)"""
+        if not self.get_components:
+            return None
+        return (thickness, _components_key(self.get_components() or []))
     
-    def _run_prediction(self):
+    def _worker_loop(self):
+        """Kalıcı tahmin thread'i - kuyruktaki işleri sırayla çalıştırır"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break  # Panel kapatıldı
+            try:
+                self._run_prediction(*job)
+            except (RuntimeError, tk.TclError):
+                break  # Panel tahmin sürerken yok edildi
+    
+    def _run_prediction(self, gen: int, thickness: float, key: Optional[tuple] = None):
         """Arka planda tahmin yap"""
+        if gen != self._gen:
+            return  # Kuyrukta beklerken iptal edildi
         try:
-            thickness = float(self.thickness_var.get() or 50)
             result = self.on_predict(thickness)
-            
-            # Ana thread'de güncelle
-            self.after(0, lambda: self._on_prediction_complete(result, thickness))
-            
-        except ValueError:
-            self.after(0, lambda: self._on_prediction_error("Geçersiz kalınlık değeri"))
         except Exception as e:
             logger.error(f"Tahmin hatası: {e}")
-            self.after(0, lambda: self._on_prediction_error(str(e)))
+            self.after(0, self._on_prediction_error, str(e), gen)
+            return
+        
+        # Ana thread'de güncelle
+        self.after(0, self._on_prediction_complete, result, thickness, gen, key)
+    
+    def _cancel_prediction(self):
+        """Süren tahmini geçersiz kıl; sonucu geldiğinde gösterilmez"""
+        self._gen += 1
+        if self.is_predicting:
+            self.is_predicting = False
+            self._set_status("ready")
+            self._set_result("ℹ️ Tahmin iptal edildi. Yeni tahmin için 'Tahmin Yap' butonuna tıklayın.")
     
-    def _on_prediction_complete(self, result: Dict, thickness: float):
+    def _on_prediction_complete(self, result: Dict, thickness: float, gen: Optional[int] = None,
+                                key: Optional[tuple] = None):
         """Tahmin tamamlandığında"""
+        if key is not None and result:
+            self._predict_cache[key] = result
+            self._predict_cache.move_to_end(key)
+            if len(self._predict_cache) > _PREDICT_CACHE_SIZE:
+                self._predict_cache.popitem(last=False)
+        if gen is not None and gen != self._gen:
+            return  # Eski (iptal edilmiş) tahmin
         self.is_predicting = False
         self._set_status("success")
         self._display_results(result, thickness)
     
-    def _on_prediction_error(self, error: str):
+    def _on_prediction_error(self, error: str, gen: Optional[int] = None):
         """Tahmin hata verdiğinde"""
+        if gen is not None and gen != self._gen:
+            return  # Eski (iptal edilmiş) tahmin
         self.is_predicting = False
         self._set_status("error")
         self._set_result(f"❌ Hata: {error}")
@@ -132,10 +244,7 @@ class PredictionPanel(ttk.LabelFrame):
             self._set_result("⚠️ Tahmin sonucu alınamadı.")
             return
         
-        lines = []
-        lines.append(f"📊 Kaplama Kalınlığı: {thickness} µm\n")
-        lines.append("=" * 40)
-        lines.append("")
+        lines = [_HEADER_TMPL.format(thickness), _SEP_EQ, ""]
         
         # Güven bilgisi (en üstte göster)
         confidence_info = result.get('confidence', {})
@@ -145,44 +254,33 @@ class PredictionPanel(ttk.LabelFrame):
             sample_count = confidence_info.get('sample_count', 0)
             
             # Güven bar'ı oluştur
-            bar_length = 20
-            filled = int(overall_conf / 100 * bar_length)
-            bar = "█" * filled + "░" * (bar_length - filled)
+            filled = int(overall_conf / 100 * _CONF_BAR_LENGTH)
+            bar = _CONF_BARS[min(max(filled, 0), _CONF_BAR_LENGTH)]
             
             lines.append(f"📈 Güven: [{bar}] {overall_conf:.0f}%")
             lines.append(f"   {conf_message}")
             lines.append(f"   (Eğitim verisi: {sample_count} kayıt)")
             lines.append("")
-            lines.append("-" * 40)
+            lines.append(_SEP_DASH)
             lines.append("")
         
         # Temel tahminler
         predictions = result.get('predictions', result)
         
-        if 'film_thickness' in predictions:
-            lines.append(f"🎯 Film Kalınlığı: {predictions['film_thickness']:.1f} µm")
-        
-        if 'opacity' in predictions:
-            lines.append(f"🎨 Örtücülük: {predictions['opacity']:.1f}%")
-        
-        if 'gloss' in predictions:
-            lines.append(f"✨ Parlaklık: {predictions['gloss']:.1f} GU")
-        elif 'gloss_60' in predictions:
-            lines.append(f"✨ Parlaklık (60°): {predictions['gloss_60']:.1f} GU")
-        
-        if 'hardness' in predictions:
-            lines.append(f"💎 Sertlik: {predictions['hardness']:.1f}")
-        
-        if 'adhesion' in predictions:
-            lines.append(f"🔗 Yapışma: {predictions['adhesion']:.1f}/5")
-        
-        if 'corrosion_resistance' in predictions:
-            lines.append(f"🛡️ Korozyon Direnci: {predictions['corrosion_resistance']:.1f}")
+        seen_gloss = False
+        for key, label, fmt in _PRED_SCHEMA:
+            if key == 'gloss_60' and seen_gloss:
+                continue
+            value = predictions.get(key)
+            if value is None:
+                continue
+            seen_gloss = seen_gloss or key == 'gloss'
+            lines.append(f"{label}: {fmt.format(value)}")
         
         # Detaylı güven bilgisi (her hedef için)
         if confidence_info and confidence_info.get('details'):
             lines.append("")
-            lines.append("-" * 40)
+            lines.append(_SEP_DASH)
             lines.append("📐 Güven Aralıkları:")
             for target, info in confidence_info.get('details', {}).items():
                 pred_val = predictions.get(target)
@@ -206,11 +304,22 @@ class PredictionPanel(ttk.LabelFrame):
         self._set_result('\n'.join(lines))
     
     def _set_result(self, text: str):
-        """Sonuç alanını güncelle"""
+        """Sonuç alanını güncelle (yalnızca değişen satırlar yeniden yazılır)"""
+        lines = text.split('\n')
+        last_lines = self._last_lines
+        if lines == last_lines:
+            return
+        
         self.result_text.config(state=tk.NORMAL)
-        self.result_text.delete(1.0, tk.END)
-        self.result_text.insert(tk.END, text)
+        if len(lines) == len(last_lines):
+            # Aynı yapı (ör. yeni kalınlıkla tekrar tahmin): satır satır değiştir
+            for i, (old, new) in enumerate(zip(last_lines, lines), start=1):
+                if old != new:
+                    self.result_text.replace(f"{i}.0", f"{i}.end", new)
+        else:
+            self.result_text.replace("1.0", tk.END, text)
         self.result_text.config(state=tk.DISABLED)
+        self._last_lines = lines
     
     def _set_status(self, status: str):
         """Durum göstergesini ayarla"""
@@ -229,8 +338,27 @@ class PredictionPanel(ttk.LabelFrame):
         state = 'normal' if enabled else 'disabled'
         self.predict_btn.config(state=state)
         self.thickness_entry.config(state=state)
+        if not enabled:
+            if self._pending_after_id is not None:
+                self.after_cancel(self._pending_after_id)
+                self._pending_after_id = None
+            self._cancel_prediction()
+    
+    def destroy(self):
+        """Tahmin thread'ini durdur ve paneli yok et"""
+        if self._worker is not None:
+            self._jobs.put(None)
+        super().destroy()
+    
+    def invalidate_cache(self):
+        """Tahmin önbelleğini boşalt (ör. model yeniden eğitildiğinde)"""
+        self._predict_cache.clear()
     
     def clear(self):
         """Sonuçları temizle"""
+        if self._pending_after_id is not None:
+            self.after_cancel(self._pending_after_id)
+            self._pending_after_id = None
+        self._cancel_prediction()
         self._set_result("ℹ️ Formülasyon hammaddelerine göre muhtemel test sonuçlarını tahmin eder.")
         self._set_status("ready")
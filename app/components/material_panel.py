@@ -83,6 +83,12 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
         self.on_material_change = on_material_change
         self.current_material_id = None
         self.materials = []
+        self._materials_by_id: Dict[int, Dict] = {}  # hammadde id (int) -> hammadde
+        self._tree_ids: List[str] = []  # ağaçtaki tüm öğeler (bağlı ya da ayrık)
+        self._visible_ids: set = set()  # filtreden geçen (bağlı) öğeler
+        self._search_names: List[str] = []  # küçük harfli adlar, _tree_ids ile aynı sırada
+        self._last_filter = None  # son uygulanan (arama, kategori)
+        self._filter_after_id = None  # bekleyen (debounce) filtreleme
         
         self.setup_i18n()
         
@@ -111,7 +117,7 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
         
         ttk.Label(filter_frame, text="🔍").pack(side=tk.LEFT)
         self.search_var = tk.StringVar()
-        self.search_var.trace('w', lambda *args: self._filter_materials())
+        self.search_var.trace('w', lambda *args: self._schedule_filter())
         ttk.Entry(filter_frame, textvariable=self.search_var, width=20).pack(side=tk.LEFT, padx=5)
         
         self.filter_cat_label = ttk.Label(filter_frame)
@@ -120,7 +126,7 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
         self.category_combo = ttk.Combobox(filter_frame, textvariable=self.category_var, 
                                        state='readonly', width=12)
         self.category_combo.pack(side=tk.LEFT, padx=5)
-        self.category_combo.bind('<<ComboboxSelected>>', lambda e: self._filter_materials())
+        self.category_combo.bind('<<ComboboxSelected>>', lambda e: self._schedule_filter())
         
         # hammadde listesi
         list_frame = ttk.Frame(self.left_frame)
@@ -456,34 +462,61 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
                         'code': row[17]
                     })
             
-            self._filter_materials()
+            self._populate_tree()
             logger.info(f"{len(self.materials)} hammadde yüklendi")
             
         except Exception as e:
             logger.error(f"hammadde yükleme hatası: {e}")
             messagebox.showerror("Hata", f"hammaddeler yüklenemedi: {e}")
     
+    def _populate_tree(self):
+        """Tüm hammaddeleri ağaca bir kez ekle; filtreleme yalnızca görünürlüğü değiştirir"""
+        tree = self.material_tree
+        if self._tree_ids:
+            tree.delete(*self._tree_ids)  # Ayrık öğeler dahil
+        
+        self._materials_by_id = {}
+        self._tree_ids = []
+        self._search_names = []
+        for mat in self.materials:
+            # Fiyat gösterimi
+            price = f"{mat.get('unit_price', 0) or 0:.2f}" if mat.get('unit_price') else "-"
+            
+            iid = tree.insert('', 'end', iid=mat['id'],
+                              values=(mat['name'], mat['category'] or '', price))
+            self._tree_ids.append(iid)
+            self._materials_by_id[mat['id']] = mat
+            self._search_names.append((mat['name'] or '').lower())
+        
+        self._last_filter = None
+        self._filter_materials()
+    
+    def _schedule_filter(self):
+        """Filtrelemeyi 150 ms ertele; hızlı tuş vuruşları tek geçişte birleşir"""
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)
+        self._filter_after_id = self.after(150, self._filter_materials)
+    
     def _filter_materials(self):
         """hammaddeleri filtrele ve listeyi güncelle"""
-        # Mevcut öğeleri temizle
-        for item in self.material_tree.get_children():
-            self.material_tree.delete(item)
-        
+        if self._filter_after_id:
+            self.after_cancel(self._filter_after_id)  # Doğrudan çağrı bekleyeni karşılar
+            self._filter_after_id = None
         search = self.search_var.get().lower()
         category = self.category_var.get()
+        if (search, category) == self._last_filter:
+            return  # Aynı filtre zaten uygulanmış
+        self._last_filter = (search, category)
         
-        for mat in self.materials:
+        visible = [
+            iid for iid, name, mat in zip(self._tree_ids, self._search_names, self.materials)
             # Filtre kontrolü
-            if search and search not in (mat['name'] or '').lower():
-                continue
-            if category != "Tümü" and mat['category'] != category:
-                continue
-            
-            # Fiyat gösterimi
-            price = f"{mat.get('unit_price', 0) or 0:.2f}" if mat.get('unit_price') else "-"
-            
-            self.material_tree.insert('', 'end', iid=mat['id'],
-                                       values=(mat['name'], mat['category'] or '', price))
+            if (not search or search in name)
+            and (category == "Tümü" or mat['category'] == category)
+        ]
+        # Eşleşenleri sırasıyla bağla, diğerlerini ayır (tek Tk çağrısı)
+        self.material_tree.set_children('', *visible)
+        self._visible_ids = set(visible)
     
     def _on_material_select(self, event):
         """hammadde seçildiğinde"""
@@ -495,7 +528,7 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
         self.current_material_id = material_id
         
         # hammadde verilerini bul
-        material = next((m for m in self.materials if m['id'] == material_id), None)
+        material = self._materials_by_id.get(material_id)
         if not material:
             return
         
@@ -561,8 +594,8 @@ class MaterialManagementPanel(ttk.Frame, I18nMixin):
             messagebox.showinfo("Başarılı", msg)
             self._load_materials()
             
-            # Select the newly saved/updated material in the tree
-            if self.current_material_id:
+            # Select the newly saved/updated material in the tree (if the filter shows it)
+            if self.current_material_id and str(self.current_material_id) in self._visible_ids:
                 try:
                     self.material_tree.selection_set(str(self.current_material_id))
                     self.material_tree.see(str(self.current_material_id))
@@ -57,6 +57,7 @@ hidden_imports = [
     'sklearn.preprocessing',
     'numpy',
     'openpyxl',
+    'xlsxwriter',
 ]
 
 a = Analysis(
@@ -0,0 +1,119 @@
+"""
+Tests for ExcelStyleGrid logic that does not need a display.
+"""
+
+import pytest
+
+from app.components.editor.excel_style_grid import ExcelStyleGrid, parse_cells, safe_float
+
+
+class _FakeTree:
+    """Minimal Treeview: ordered items with values and tags"""
+
+    def __init__(self):
+        self.items = {}
+        self._next = 0
+
+    def insert(self, parent, index, values=(), tags=()):
+        self._next += 1
+        item_id = f'I{self._next:03d}'
+        self.items[item_id] = {'values': tuple(values), 'tags': tuple(tags)}
+        return item_id
+
+    def get_children(self, item=''):
+        return tuple(self.items)
+
+    def delete(self, *item_ids):
+        for item_id in item_ids:
+            del self.items[item_id]
+
+    def exists(self, item_id):
+        return item_id in self.items
+
+    def item(self, item_id, option=None, **kwargs):
+        if kwargs:
+            self.items[item_id].update((key, tuple(value)) for key, value in kwargs.items())
+            return None
+        return self.items[item_id][option]
+
+
+def _make_grid():
+    """Grid with a fake tree, bypassing the Tk widgets"""
+    grid = ExcelStyleGrid.__new__(ExcelStyleGrid)
+    grid.tree = _FakeTree()
+    grid.row_count = 0
+    grid.row_data = {}
+    grid._pending_rows = []
+    grid._last_row_iid = None
+    return grid
+
+
+def _rows(count):
+    return [{'material_code': f'M{i}', 'material_name': f'Material {i}', 'weight': 2.0,
+             'solid_content': 50, 'unit_price': 3.0} for i in range(count)]
+
+
+class TestLazyRendering:
+    def test_only_the_first_batch_is_inserted(self):
+        grid = _make_grid()
+
+        grid.load_data(_rows(ExcelStyleGrid.RENDER_BATCH + 30))
+
+        assert len(grid.tree.items) == ExcelStyleGrid.RENDER_BATCH
+        assert len(grid._pending_rows) == 30
+        assert grid.has_pending_rows()
+
+    def test_get_data_includes_pending_rows(self):
+        grid = _make_grid()
+        count = ExcelStyleGrid.RENDER_BATCH + 30
+
+        grid.load_data(_rows(count))
+        data = grid.get_data()
+
+        assert [row['material_code'] for row in data] == [f'M{i}' for i in range(count)]
+        assert data[-1]['row_num'] == str(count)
+        assert data[-1]['weight'] == 2.0
+        assert data[-1]['solid_content'] == 50
+
+    def test_get_totals_includes_pending_rows(self):
+        grid = _make_grid()
+        count = ExcelStyleGrid.RENDER_BATCH + 30
+
+        grid.load_data(_rows(count))
+        totals = grid.get_totals()
+
+        assert totals['row_count'] == count
+        assert totals['total_quantity'] == pytest.approx(2.0 * count)
+        assert totals['total_solid'] == pytest.approx(1.0 * count)
+        assert totals['total_cost'] == pytest.approx(6.0 * count)
+
+    def test_totals_are_unchanged_by_rendering_the_rest(self):
+        grid = _make_grid()
+        grid.load_data(_rows(ExcelStyleGrid.RENDER_BATCH + 30))
+        before = grid.get_totals()
+
+        grid._render_pending(ExcelStyleGrid.RENDER_BATCH)
+
+        assert not grid.has_pending_rows()
+        assert grid.get_totals() == before
+        # An empty row for new input follows the last rendered row
+        last = grid.tree.items[grid._last_row_iid]
+        assert last['tags'] == ('empty',)
+
+
+class TestParseCells:
+    CELLS = ['', None, '1.5', ' 2,25 ', '1 000', '-3', 4, 2.5, 'abc', '1.2.3', '   ', '1e3']
+
+    @pytest.mark.parametrize('default', [0.0, 100.0])
+    def test_matches_safe_float(self, default):
+        values, valid = parse_cells(self.CELLS, default)
+
+        expected = [safe_float(cell, default) for cell in self.CELLS]
+        assert values == [value for value, _ in expected]
+        assert valid == [ok for _, ok in expected]
+
+    def test_invalid_cells_fall_back_to_default(self):
+        values, valid = parse_cells(['abc', ''], 7.0)
+
+        assert values == [7.0, 7.0]
+        assert valid == [False, True]
@@ -0,0 +1,259 @@
+"""
+Tests for ModernFormulationEditor logic that does not need a display.
+"""
+
+import random
+import sys
+
+import pytest
+
+from app.components.editor.excel_style_grid import ExcelStyleGrid
+from app.components.editor.modern_formulation_editor import ModernFormulationEditor
+
+
+class _FakeLabel:
+    def __init__(self):
+        self.text = None
+
+    def config(self, text=None):
+        self.text = text
+
+
+class _FakeGrid:
+    """Rows as grid value tuples; totals computed like ExcelStyleGrid"""
+
+    def __init__(self):
+        self.rows = {}
+
+    def get_row_totals(self, item_id):
+        values = self.rows.get(item_id)
+        return ExcelStyleGrid._row_totals(values) if values else (0, 0, 0, 0)
+
+    def get_totals(self, per_row=None):
+        totals = {'total_quantity': 0, 'total_solid': 0, 'total_cost': 0, 'row_count': 0}
+        for item_id, values in self.rows.items():
+            row = ExcelStyleGrid._row_totals(values)
+            if per_row is not None:
+                per_row[item_id] = row
+            totals['total_quantity'] += row[0]
+            totals['total_solid'] += row[1]
+            totals['total_cost'] += row[2]
+            totals['row_count'] += row[3]
+        q = totals['total_quantity']
+        totals['solid_percent'] = (totals['total_solid'] / q * 100) if q > 0 else 0
+        return totals
+
+    def has_pending_rows(self):
+        return False
+
+
+def _make_editor():
+    """Editor with only the summary state, bypassing the Tk widgets"""
+    editor = ModernFormulationEditor.__new__(ModernFormulationEditor)
+    editor.grid = _FakeGrid()
+    editor.summary_labels = {key: (_FakeLabel(), _FakeLabel()) for key in
+                             ('total_quantity', 'total_solid', 'solid_percent', 'total_cost', 'row_count')}
+    editor._bulk_loading = False
+    editor._in_summary = False
+    editor._summary_after_id = None
+    editor._last_summary = {}
+    editor._totals_cache = None
+    editor._row_contributions = {}
+    editor._contributions_complete = False
+    editor._deltas_since_sync = 0
+    editor.after_idle = lambda func: 'after#1'
+    editor.after_cancel = lambda after_id: None
+    return editor
+
+
+def _row(weight, solid_pct, price):
+    solid = weight * solid_pct / 100
+    return ('', 'MAT', 'Material', weight, solid_pct, solid, price, weight * price)
+
+
+class TestRunningTotals:
+    def test_add_then_delete_rows_returns_exact_zero(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            editor = _make_editor()
+            editor._update_summary(full=True)
+            ids = []
+            for i in range(rng.randint(1, 12)):
+                item_id = f'I{i}'
+                editor.grid.rows[item_id] = _row(rng.uniform(0.01, 50), rng.uniform(1, 100), rng.uniform(0, 20))
+                ids.append(item_id)
+                editor._on_row_changed(item_id)
+                editor._flush_summary()
+            rng.shuffle(ids)
+            for item_id in ids:
+                del editor.grid.rows[item_id]
+                editor._on_row_changed(item_id)
+                editor._flush_summary()
+
+            totals = editor._totals_cache
+            assert totals['total_quantity'] == 0
+            assert totals['total_solid'] == 0
+            assert totals['total_cost'] == 0
+            assert totals['solid_percent'] == 0
+            assert totals['row_count'] == 0
+            assert editor.summary_labels['total_quantity'][1].text == "0.00 kg"
+            assert editor.summary_labels['solid_percent'][1].text == "0.0%"
+
+    def test_running_totals_match_full_sum(self):
+        rng = random.Random(7)
+        editor = _make_editor()
+        editor._update_summary(full=True)
+        for step in range(300):
+            item_id = f'I{rng.randint(0, 9)}'
+            if item_id in editor.grid.rows and rng.random() < 0.4:
+                del editor.grid.rows[item_id]
+            else:
+                editor.grid.rows[item_id] = _row(rng.uniform(0.01, 50), rng.uniform(1, 100), rng.uniform(0, 20))
+            editor._on_row_changed(item_id)
+            editor._flush_summary()
+
+        expected = editor.grid.get_totals()
+        for key in ('total_quantity', 'total_solid', 'total_cost'):
+            assert abs(editor._totals_cache[key] - expected[key]) < 1e-6
+        assert editor._totals_cache['row_count'] == expected['row_count']
+
+
+class TestTemplateRoundTrip:
+    def test_imported_template_creates_no_materials(self, tmp_path, monkeypatch):
+        pytest.importorskip('pandas')
+        pytest.importorskip('xlsxwriter')
+        pytest.importorskip('openpyxl')
+        from app.components.editor import modern_formulation_editor as mfe
+
+        path = str(tmp_path / 'template.xlsx')
+        ModernFormulationEditor._write_template(path, 'error', 'title')
+        df = ModernFormulationEditor._read_sheet(path)
+
+        created = []
+        shown = []
+        editor = _make_editor()
+        editor.on_lookup_material = lambda code: None
+        editor.on_create_material = lambda code, name: created.append(code) or True
+        editor.on_lookup_materials_bulk = None
+        editor.on_create_materials_bulk = None
+        editor._bulk_load = lambda rows: shown.append(rows)
+        editor.invalidate_materials_cache = lambda: None
+        monkeypatch.setattr(mfe.messagebox, 'showwarning', lambda *args, **kwargs: shown.append(args))
+        monkeypatch.setattr(mfe.messagebox, 'showinfo', lambda *args, **kwargs: None)
+        monkeypatch.setattr(mfe.messagebox, 'showerror', lambda *args, **kwargs: pytest.fail(str(args)))
+
+        editor._finish_import(df, None)
+
+        assert created == []
+
+    def test_instruction_rows_of_old_templates_are_skipped(self, monkeypatch):
+        pd = pytest.importorskip('pandas')
+        from app.components.editor import modern_formulation_editor as mfe
+
+        df = pd.DataFrame({
+            'Raw Material Code': ['EP01', '💡 Hammadde Kodu giriniz. Yeni kodlar otomatik olarak veritabanına eklenecektir.'],
+            'Material Name': ['Epoxy', None],
+            'Quantity (kg)': [10, None],
+        })
+        created = []
+        loaded = []
+        editor = _make_editor()
+        editor.on_lookup_material = lambda code: None
+        editor.on_create_material = lambda code, name: created.append(code) or True
+        editor.on_lookup_materials_bulk = None
+        editor.on_create_materials_bulk = None
+        editor._bulk_load = loaded.extend
+        editor.invalidate_materials_cache = lambda: None
+        monkeypatch.setattr(mfe.messagebox, 'showinfo', lambda *args, **kwargs: None)
+        monkeypatch.setattr(mfe.messagebox, 'showerror', lambda *args, **kwargs: pytest.fail(str(args)))
+
+        editor._finish_import(df, None)
+
+        assert created == ['EP01']
+        assert [row['material_code'] for row in loaded] == ['EP01']
+
+
+class TestFormulationListCache:
+    def _editor(self):
+        editor = _make_editor()
+        editor._filter_cache_key = None
+        editor._filter_cache_result = ((), ())
+        editor._last_formulation_values = ()
+        editor._formulation_values_set = frozenset()
+        editor.formulation_list = []
+        editor._formulation_index = {}
+
+        class _Combo(dict):
+            def get(self):
+                return ''
+
+            def set(self, value):
+                pass
+
+        editor.formulation_combo = _Combo()
+        return editor
+
+    def test_same_ids_are_not_filtered_again(self, monkeypatch):
+        editor = self._editor()
+        formulations = [{'id': 1, 'formula_code': 'F-001', 'formula_name': 'Primer'},
+                        {'id': None, 'formula_code': 'F-002'}]
+        calls = []
+        original = ModernFormulationEditor._filter_formulations
+        monkeypatch.setattr(ModernFormulationEditor, '_filter_formulations',
+                            staticmethod(lambda rows: calls.append(1) or original(rows)))
+
+        editor.load_formulation_list(formulations)
+        # Callers pass a fresh copy each time (ProjectContext, DB queries)
+        copy = [dict(f) for f in formulations]
+        editor.load_formulation_list(copy)
+        assert len(calls) == 1
+        assert editor.formulation_combo['values'] == ('F-001 - Primer',)
+        assert editor.formulation_list[0] is copy[0]
+
+        formulations.append({'id': 3, 'formula_code': 'F-003'})
+        editor.load_formulation_list(formulations)
+        assert len(calls) == 2
+        assert editor.formulation_combo['values'] == ('F-001 - Primer', 'F-003')
+
+        editor.clear_formulation_cache()
+        editor.load_formulation_list(formulations)
+        assert len(calls) == 3
+
+
+class TestExport:
+    def _export(self, tmp_path, monkeypatch):
+        from app.components.editor import modern_formulation_editor as mfe
+
+        path = str(tmp_path / 'export.xlsx')
+        shown = []
+        editor = _make_editor()
+        editor.grid.get_data = lambda: [{'row_num': 1, 'material_code': 'EP01', 'material_name': 'Epoxy',
+                                         'weight': 10.0, '_valid': True}]
+        editor._run_in_background = lambda work, done: done(None, _call(work))
+        monkeypatch.setattr(mfe.filedialog, 'asksaveasfilename', lambda **kwargs: path)
+        monkeypatch.setattr(mfe.messagebox, 'showinfo', lambda *args, **kwargs: shown.append(args))
+        monkeypatch.setattr(mfe.messagebox, 'showerror', lambda *args, **kwargs: pytest.fail(str(args)))
+
+        editor._export_to_excel()
+
+        assert len(shown) == 1
+        return path
+
+    def test_falls_back_to_openpyxl_without_xlsxwriter(self, tmp_path, monkeypatch):
+        openpyxl = pytest.importorskip('openpyxl')
+        monkeypatch.setitem(sys.modules, 'xlsxwriter', None)
+
+        path = self._export(tmp_path, monkeypatch)
+
+        rows = list(openpyxl.load_workbook(path).active.iter_rows(values_only=True))
+        assert rows[0][:3] == ('#', 'Hammadde Kodu', 'Hammadde')
+        assert rows[1][:4] == (1, 'EP01', 'Epoxy', 10)
+
+
+def _call(work):
+    """Run work() and return its exception, like _run_in_background"""
+    try:
+        work()
+    except Exception as e:
+        return e
+    return None
@@ -0,0 +1,85 @@
+"""
+Tests for FormulationSummary logic that does not need a display.
+"""
+
+from app.components.editor import formulation_summary
+from app.components.editor.formulation_summary import FormulationSummary
+
+
+class _FakeVar:
+    def __init__(self):
+        self.value = ''
+
+    def set(self, value):
+        self.value = value
+
+
+def _make_summary():
+    """Summary with the label writes queued instead of run by Tk"""
+    summary = FormulationSummary.__new__(FormulationSummary)
+    summary._last_text = {}
+    summary._raw = dict(formulation_summary._ZERO_RAW)
+    summary._pending_data = None
+    summary._after_id = None
+    summary._last_totals_key = None
+    summary._scratch = dict(formulation_summary._ZERO_RAW)
+    left, right = _FakeVar(), _FakeVar()
+    summary._sides = ((left, formulation_summary._LEFT_FIELDS),
+                      (right, formulation_summary._RIGHT_FIELDS))
+    summary._update_plan = tuple(
+        (key, side, formulation_summary._FMT_FORMAT[key])
+        for side in summary._sides
+        for key, _, _, _ in side[1]
+    )
+    summary.idle_calls = []
+
+    def after_idle(func):
+        summary.idle_calls.append(func)
+        return 'after#%d' % len(summary.idle_calls)
+
+    summary.after_idle = after_idle
+    summary.after_cancel = lambda after_id: None
+    return summary
+
+
+def _run_idle(summary):
+    calls, summary.idle_calls = summary.idle_calls, []
+    for func in calls:
+        func()
+
+
+class TestUpdateFromGrid:
+    def test_get_summary_is_current_before_idle_flush(self):
+        summary = _make_summary()
+        summary.update_from_grid({'total_amount': 200.0, 'total_solid': 50.0,
+                                  'total_price': 30.0, 'row_count': 2})
+
+        result = summary.get_summary()
+
+        assert result['total_solid'] == 50.0
+        assert result['total_cost'] == 30.0
+        assert result['pvc'] == 25.0
+        assert result['row_count'] == 2
+        # Labels are still written only on idle
+        assert summary._sides[0][0].value == ''
+
+    def test_burst_of_updates_writes_labels_once(self):
+        summary = _make_summary()
+        for amount in (100.0, 150.0, 200.0):
+            summary.update_from_grid({'total_amount': amount, 'total_solid': 50.0,
+                                      'total_price': 10.0, 'row_count': 1})
+
+        assert len(summary.idle_calls) == 1
+        _run_idle(summary)
+
+        assert '25.00 %' in summary._sides[1][0].value
+        assert summary.get_summary()['pvc'] == 25.0
+
+    def test_clear_before_flush_resets_raw_values(self):
+        summary = _make_summary()
+        summary.update_from_grid({'total_amount': 100.0, 'total_solid': 40.0,
+                                  'total_price': 5.0, 'row_count': 1})
+
+        summary.clear()
+
+        assert summary.get_summary() == formulation_summary._ZERO_RAW
@@ -0,0 +1,135 @@
+"""
+Tests for MaterialManagementPanel filtering that does not need a display.
+"""
+
+from app.components.material_panel import MaterialManagementPanel
+
+
+class _FakeVar:
+    def __init__(self, value=''):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+class _FakeTree:
+    """Treeview stand-in that tracks attached (visible) items"""
+
+    def __init__(self):
+        self.items = []
+        self.attached = []
+        self.set_children_calls = 0
+
+    def insert(self, parent, index, iid=None, values=()):
+        iid = str(iid)  # Tk returns item ids as strings
+        self.items.append(iid)
+        self.attached.append(iid)
+        return iid
+
+    def delete(self, *item_ids):
+        for iid in item_ids:
+            self.items.remove(iid)
+            if iid in self.attached:
+                self.attached.remove(iid)
+
+    def set_children(self, parent, *item_ids):
+        self.set_children_calls += 1
+        self.attached = list(item_ids)
+
+
+def _make_panel(materials):
+    """Panel with the filter state only; after() callbacks are queued by hand"""
+    panel = MaterialManagementPanel.__new__(MaterialManagementPanel)
+    panel.materials = materials
+    panel._materials_by_id = {}
+    panel._tree_ids = []
+    panel._visible_ids = set()
+    panel._search_names = []
+    panel._last_filter = None
+    panel._filter_after_id = None
+    panel.material_tree = _FakeTree()
+    panel.search_var = _FakeVar()
+    panel.category_var = _FakeVar('Tümü')
+    panel.scheduled = {}
+
+    def after(ms, func):
+        after_id = f'after#{len(panel.scheduled) + 1}'
+        panel.scheduled[after_id] = func
+        return after_id
+
+    panel.after = after
+    panel.after_cancel = lambda after_id: panel.scheduled.pop(after_id, None)
+    return panel
+
+
+def _run_scheduled(panel):
+    callbacks, panel.scheduled = list(panel.scheduled.values()), {}
+    for func in callbacks:
+        func()
+
+
+MATERIALS = [
+    {'id': 1, 'name': 'Epoxy Resin', 'category': 'binder', 'unit_price': 5.0},
+    {'id': 2, 'name': 'Titanium Dioxide', 'category': 'pigment', 'unit_price': 3.0},
+    {'id': 3, 'name': 'Epoxy Hardener', 'category': 'additive', 'unit_price': None},
+]
+
+
+class TestMaterialFilter:
+    def test_populate_inserts_each_row_once(self):
+        panel = _make_panel(MATERIALS)
+
+        panel._populate_tree()
+
+        assert panel.material_tree.items == ['1', '2', '3']
+        assert panel._visible_ids == {'1', '2', '3'}
+        assert panel._materials_by_id[2]['name'] == 'Titanium Dioxide'
+
+    def test_typing_burst_filters_once(self):
+        panel = _make_panel(MATERIALS)
+        panel._populate_tree()
+        calls_before = panel.material_tree.set_children_calls
+
+        for text in ('e', 'ep', 'epo', 'epox'):
+            panel.search_var.value = text
+            panel._schedule_filter()
+
+        assert len(panel.scheduled) == 1
+        _run_scheduled(panel)
+
+        assert panel.material_tree.set_children_calls == calls_before + 1
+        assert panel.material_tree.attached == ['1', '3']
+        assert panel._visible_ids == {'1', '3'}
+
+    def test_search_and_category_combine(self):
+        panel = _make_panel(MATERIALS)
+        panel._populate_tree()
+
+        panel.search_var.value = 'epoxy'
+        panel.category_var.value = 'additive'
+        panel._schedule_filter()
+        _run_scheduled(panel)
+
+        assert panel.material_tree.attached == ['3']
+
+    def test_same_filter_is_not_reapplied(self):
+        panel = _make_panel(MATERIALS)
+        panel._populate_tree()
+        calls_before = panel.material_tree.set_children_calls
+
+        panel._schedule_filter()
+        _run_scheduled(panel)
+
+        assert panel.material_tree.set_children_calls == calls_before
+
+    def test_direct_filter_cancels_the_pending_one(self):
+        panel = _make_panel(MATERIALS)
+        panel._populate_tree()
+
+        panel.search_var.value = 'titan'
+        panel._schedule_filter()
+        panel._filter_materials()
+
+        assert panel.scheduled == {}
+        assert panel.material_tree.attached == ['2']
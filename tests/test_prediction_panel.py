@@ -0,0 +1,88 @@
+"""
+Tests for PredictionPanel logic that does not need a display.
+"""
+
+from collections import OrderedDict
+
+from app.components.editor.prediction_panel import PredictionPanel
+
+
+class _FakeVar:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def _make_panel(components):
+    """Panel whose worker and after() calls run synchronously"""
+    panel = PredictionPanel.__new__(PredictionPanel)
+    panel.calls = []
+
+    def on_predict(thickness):
+        panel.calls.append(thickness)
+        return {'predictions': {'gloss': 80.0 + len(panel.calls)}}
+
+    panel.on_predict = on_predict
+    panel.get_components = lambda: components
+    panel.is_predicting = False
+    panel._gen = 0
+    panel._pending_after_id = None
+    panel._predict_cache = OrderedDict()
+    panel.thickness_var = _FakeVar('50')
+    panel.shown = []
+    panel._set_status = lambda status: None
+    panel._set_result = lambda text: None
+    panel._display_results = lambda result, thickness: panel.shown.append(result)
+    panel.after = lambda ms, func, *args: func(*args)
+    panel._worker = object()
+
+    class _Jobs:
+        def put(self, job):
+            panel._run_prediction(*job)
+
+    panel._jobs = _Jobs()
+    return panel
+
+
+def _component(code, weight, solid_pct):
+    return {'material_code': code, 'material_name': code, 'weight': weight, 'solid_pct': solid_pct}
+
+
+class TestPredictionCache:
+    def test_same_formulation_and_thickness_skips_the_model(self):
+        components = [_component('EP01', 10.0, 60.0)]
+        panel = _make_panel(components)
+
+        panel._really_predict()
+        panel._really_predict()
+
+        assert panel.calls == [50.0]
+        assert panel.shown[0] == panel.shown[1]
+
+    def test_amount_solid_code_and_thickness_are_part_of_the_key(self):
+        components = [_component('EP01', 10.0, 60.0)]
+        panel = _make_panel(components)
+        panel._really_predict()
+
+        components[0] = _component('EP01', 12.0, 60.0)
+        panel._really_predict()
+        components[0] = _component('EP01', 12.0, 55.0)
+        panel._really_predict()
+        components[0] = _component('EP02', 12.0, 55.0)
+        panel._really_predict()
+        panel.thickness_var.value = '80'
+        panel._really_predict()
+
+        assert len(panel.calls) == 5
+
+    def test_manual_rows_without_material_id_are_distinguished(self):
+        components = [{'material_id': None, 'material_code': 'X1', 'weight': 5.0, 'solid_pct': 100.0}]
+        panel = _make_panel(components)
+        panel._really_predict()
+
+        components[0] = {'material_id': None, 'material_code': 'X2', 'weight': 5.0, 'solid_pct': 100.0}
+        panel._really_predict()
+
+        assert len(panel.calls) == 2